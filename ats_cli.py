@@ -6,7 +6,9 @@ Interactive command-line interface for optimizing resumes
 
 import os
 import sys
-from ats_optimizer import analyze_job_description, inject_invisible_keywords, extract_smart_keywords, extract_missing_keywords_llm
+from ats_optimizer import analyze_job_description, inject_invisible_keywords, extract_smart_keywords, extract_missing_keywords_llm, extract_local_missing_keywords, plan_llm_escalations
+from llm_scheduler import PRIORITY_INTERACTIVE
+from skills_section import SKILLS_ALLOWLIST_FILE, load_skill_allowlist, match_allowed_skills, review_skills, write_skills_section
 
 def get_user_input():
     """Get job description from user input"""
@@ -82,13 +84,36 @@ def select_strategy():
     print("\nKeyword Extraction Strategy:")
     print("1. Default (spaCy-based, current)")
     print("2. LLM-based (extract only missing, important keywords)")
-    choice = input("Select strategy (1-2, default 1): ").strip()
+    print("3. Hybrid (spaCy first, LLM only if spaCy looks unsure)")
+    choice = input("Select strategy (1-3, default 1): ").strip()
     if choice == "2":
         return "llm-keyword-inject"
+    if choice == "3":
+        return "hybrid"
     return "default"
 
+def select_output_mode():
+    """Select how keywords are written into the resume"""
+    print("\nOutput Mode:")
+    print("1. Invisible keywords (metadata, hidden and white text)")
+    print(f"2. Visible 'Relevant Skills' section (only skills in {SKILLS_ALLOWLIST_FILE})")
+    choice = input("Select output mode (1-2, default 1): ").strip()
+    if choice == "2":
+        return "visible-skills"
+    return "invisible"
+
+def print_help():
+    """Print usage without loading any heavy dependency"""
+    print(__doc__.strip())
+    print("\nUsage: python3.10 ats_cli.py [-h | --help]")
+    print("Runs interactively; all options are chosen from the menus.")
+
 def main():
     """Main CLI function"""
+    if any(arg in ('-h', '--help') for arg in sys.argv[1:]):
+        print_help()
+        return
+    
     try:
         # Get job description
         jd_text = get_user_input()
@@ -107,6 +132,15 @@ def main():
         
         # Select strategy
         strategy = select_strategy()
+        output_mode = select_output_mode()
+        
+        allowlist = {}
+        if output_mode == "visible-skills":
+            allowlist = load_skill_allowlist()
+            if not allowlist:
+                print(f"❌ {SKILLS_ALLOWLIST_FILE} not found or empty!")
+                print("   List the skills you actually have, one per line")
+                return
         
         # Configure output
         output_dir = "optimized_resume"
@@ -118,24 +152,43 @@ def main():
         generate_pdf = input("\n📄 Generate PDF version? (y/n): ").lower().startswith('y')
         
         # Extract keywords based on strategy
-        if strategy == "llm-keyword-inject":
+        if strategy in ("llm-keyword-inject", "hybrid"):
             with open(resume_file, "rb") as f:
                 import docx
                 doc = docx.Document(f)
                 resume_text = "\n".join([p.text for p in doc.paragraphs])
-            keywords = extract_missing_keywords_llm(jd_text, resume_text)
+        
+        if strategy == "llm-keyword-inject":
+            keywords = extract_missing_keywords_llm(jd_text, resume_text, priority=PRIORITY_INTERACTIVE)
             print(f"\n🔑 LLM-extracted missing keywords: {', '.join(keywords[:10])}")
+        elif strategy == "hybrid":
+            keywords, confidence = extract_local_missing_keywords(jd_text, resume_text)
+            if plan_llm_escalations({0: confidence}):
+                print(f"\n🤖 Local confidence {confidence:.2f} - asking the LLM")
+                keywords = extract_missing_keywords_llm(jd_text, resume_text, priority=PRIORITY_INTERACTIVE)
+            else:
+                print(f"\n⚡ Local confidence {confidence:.2f} - LLM not needed")
+            print(f"🔑 Missing keywords: {', '.join(keywords[:10])}")
         else:
             keywords = analyze_job_description(jd_text)
         
         # Process resume
         print(f"\n🔄 Processing resume: {resume_file}")
-        success = inject_invisible_keywords(
-            resume_file, 
-            keywords, 
-            output_docx, 
-            output_pdf if generate_pdf else None
-        )
+        if output_mode == "visible-skills":
+            skills = review_skills(match_allowed_skills(keywords, allowlist))
+            success = write_skills_section(
+                resume_file,
+                skills,
+                output_docx,
+                output_pdf if generate_pdf else None
+            )
+        else:
+            success = inject_invisible_keywords(
+                resume_file, 
+                keywords, 
+                output_docx, 
+                output_pdf if generate_pdf else None
+            )
         
         if success:
             print(f"\n🎉 Optimization complete!")
@@ -148,7 +201,10 @@ def main():
             print(f"   • Test with ATS scanners online")
             print(f"   • Use DOCX for online applications")
             print(f"   • Use PDF for email submissions")
-            print(f"   • Keywords are completely invisible to humans")
+            if output_mode == "visible-skills":
+                print(f"   • Review the 'Relevant Skills' section before sending")
+            else:
+                print(f"   • Keywords are completely invisible to humans")
         
     except KeyboardInterrupt:
         print("\n\n👋 Goodbye!")
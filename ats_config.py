@@ -0,0 +1,175 @@
+# ats_config.py
+"""
+Hot-reloadable configuration
+Values come from the dataclass defaults, then ats_config.json, then ATS_*
+environment variables. get_config() re-reads the file whenever it changes,
+so long-running and batch runs pick up new settings without a restart.
+"""
+
+import os
+import json
+import threading
+from dataclasses import dataclass, fields, replace
+
+CONFIG_FILE = os.environ.get("ATS_CONFIG_FILE", "ats_config.json")
+ENV_PREFIX = "ATS_"
+
+
+@dataclass(frozen=True)
+class ATSConfig:
+    # Keyword scoring
+    tech_weight: float = 3
+    entity_weight: float = 2
+    noun_weight: float = 1
+    phrase_weight: float = 2
+    max_keywords: int = 50
+
+    # Document output. 'patch' rewrites only the XML parts that change and
+    # copies the rest of the DOCX byte for byte; 'python-docx' re-serialises it
+    metadata_chunk_size: int = 200
+    docx_writer: str = 'patch'
+
+    # Models
+    spacy_model: str = 'en_core_web_sm'
+    llm_model: str = 'moonshotai/Kimi-K2-Instruct-0905:groq'
+    llm_api_url: str = 'https://router.huggingface.co/v1/chat/completions'
+    llm_timeout: float = 60
+    llm_temperature: float = 0.1
+    llm_max_tokens: int = 500
+
+    # Job descriptions are language-identified and parsed with that language's
+    # pipeline ("lang:model,..."; English uses spacy_model). Languages without
+    # an installed model are scored on technical terms only. At most
+    # max_loaded_models pipelines stay loaded, least recently used evicted first
+    language_detection: bool = True
+    language_models: str = ('de:de_core_news_sm,fr:fr_core_news_sm,es:es_core_news_sm,'
+                            'it:it_core_news_sm,nl:nl_core_news_sm,pt:pt_core_news_sm')
+    max_loaded_models: int = 2
+
+    # Provider quotas enforced by the shared LLM scheduler (0 disables a limit).
+    # Every process using the same llm_quota_file draws on one budget, so the
+    # CLI and a running batch never exceed it together ('' limits each process
+    # on its own)
+    llm_requests_per_minute: int = 30
+    llm_tokens_per_minute: int = 30000
+    llm_max_retries: int = 3
+    llm_quota_file: str = '.ats_llm_quota.json'
+
+    # Batch execution and telemetry ('auto', 'tty', 'plain' or 'none')
+    batch_workers: int = 1
+    progress_view: str = 'auto'
+
+    # Treat synonyms and near-identical spellings as already on the resume
+    semantic_matching: bool = True
+    semantic_match_threshold: float = 0.85
+
+    # Resume token analyses are persisted here, keyed by a hash of the resume
+    # text, and shared by every job and process ('' keeps them in memory only)
+    analysis_cache_dir: str = '.ats_cache'
+
+    # Hybrid strategy: jobs whose local confidence is below the threshold are
+    # sent to the LLM, least confident first, at most hybrid_llm_budget per run
+    hybrid_confidence_threshold: float = 0.5
+    hybrid_llm_budget: int = 10
+
+    # Deterministic builds: byte-identical DOCX output for identical inputs
+    # (fixed zip timestamps and entry order, alphabetical keyword ties) and a
+    # content-addressed store that serves repeated batch jobs without rerunning
+    deterministic: bool = False
+    output_store: str = '.ats_store'
+
+
+_FIELD_TYPES = {f.name: f.type for f in fields(ATSConfig)}
+_lock = threading.Lock()
+_config = None
+_config_stamp = None
+_dotenv_loaded = False
+
+
+def _coerce(name, value):
+    """Convert a file or environment value to the field's declared type"""
+    field_type = _FIELD_TYPES[name]
+    if field_type is bool and isinstance(value, str):
+        return value.strip().lower() in ('1', 'true', 'yes', 'on')
+    return field_type(value)
+
+
+def _apply(config, values, source):
+    """Return config with every valid value applied, warning about the rest"""
+    updates = {}
+    for name, value in values.items():
+        if name not in _FIELD_TYPES:
+            print(f"⚠ Unknown config key '{name}' in {source} - ignored")
+            continue
+        try:
+            updates[name] = _coerce(name, value)
+        except (TypeError, ValueError):
+            print(f"⚠ Invalid value for '{name}' in {source}: {value!r} - ignored")
+    return replace(config, **updates)
+
+
+def _file_stamp(filename):
+    """Return a cheap fingerprint of the config file, or None if it is missing"""
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _load_dotenv():
+    """Load .env into the environment once, on first config load
+
+    Done here rather than at import time so the CLI menus never pay for it;
+    every path that needs HF_TOKEN or ATS_* variables reads the config first.
+    """
+    global _dotenv_loaded
+    if not _dotenv_loaded:
+        _dotenv_loaded = True
+        from dotenv import load_dotenv
+        load_dotenv()
+
+
+def load_config(filename=CONFIG_FILE):
+    """Build a config from defaults, the config file and environment overrides"""
+    _load_dotenv()
+    config = ATSConfig()
+
+    if os.path.exists(filename):
+        try:
+            with open(filename, 'r', encoding='utf-8') as f:
+                config = _apply(config, json.load(f), filename)
+        except (OSError, ValueError) as e:
+            print(f"⚠ Could not read {filename}: {e} - using defaults")
+
+    env_values = {name: os.environ[ENV_PREFIX + name.upper()] for name in _FIELD_TYPES
+                  if ENV_PREFIX + name.upper() in os.environ}
+    return _apply(config, env_values, "environment")
+
+
+def reload_config(filename=CONFIG_FILE):
+    """Re-read the config file and environment now"""
+    global _config, _config_stamp
+    with _lock:
+        _config_stamp = _file_stamp(filename)
+        _config = load_config(filename)
+        return _config
+
+
+def get_config(filename=CONFIG_FILE):
+    """Return the current config, reloading it if the config file has changed
+
+    The check is a single stat call, so it is cheap enough to make once per job.
+    Objects built from the old config (loaded models, caches) are not touched.
+    """
+    global _config, _config_stamp
+    stamp = _file_stamp(filename)
+    with _lock:
+        if _config is not None and stamp == _config_stamp:
+            return _config
+        reloaded = _config is not None
+        _config_stamp = stamp
+        _config = load_config(filename)
+    if reloaded:
+        print(f"🔁 Configuration reloaded from {filename}")
+    return _config
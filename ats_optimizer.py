@@ -1,109 +1,226 @@
-import docx
-import spacy
-from docx.oxml import OxmlElement
-from docx.oxml.ns import qn
-from docx.shared import RGBColor
-from docx2pdf import convert
+# Heavy dependencies (spacy, docx, docx2pdf, requests) are imported inside the
+# functions that need them, so the CLI menus appear without loading them
 import os
 import re
 from collections import Counter
-import xml.etree.ElementTree as ET
-import requests
-from dotenv import load_dotenv
 import json
 from llm_prompt import LLM_KEYWORD_EXTRACTION_PROMPT
+from jd_sections import OTHER, condense_job_description, iter_section_chunks, iter_sections, is_boilerplate, section_weight
+from ats_config import get_config
+from jd_language import DEFAULT_LANGUAGE, PipelineCache, detect_language, model_for_language, phrases_for_language
+from llm_scheduler import PRIORITY_BATCH, RateLimitError, estimate_tokens, format_metrics, get_scheduler
 
-load_dotenv()
 
-
-def load_spacy_model():
+def load_spacy_model(model_name='en_core_web_sm'):
+    import spacy
     try:
-        return spacy.load('en_core_web_sm')
+        return spacy.load(model_name)
     except OSError:
-        print("SpaCy model not found. Please run: python -m spacy download en_core_web_sm")
+        print(f"SpaCy model not found. Please run: python -m spacy download {model_name}")
         exit(1)
 
 
-nlp = load_spacy_model()
+def _load_pipeline(model_name):
+    import spacy
+    return spacy.load(model_name)
 
 
-def extract_smart_keywords(jd_text, max_keywords=50):
-    """Extract and rank keywords from job description with relevance scoring"""
-    doc = nlp(jd_text.lower())
+# Pipelines in use stay warm across jobs and config reloads; the least
+# recently used one is dropped once max_loaded_models are loaded
+_pipelines = PipelineCache(_load_pipeline)
+_fallback_model = None
+
+
+def get_nlp(language=None, required=True):
+    """Return the spaCy pipeline for a language (default English), loading it on first use
 
-    tech_patterns = [
-        r'\b(?:python|java|javascript|react|node\.?js|aws|docker|kubernetes|sql|nosql)\b',
-        r'\b(?:machine learning|deep learning|ai|artificial intelligence|nlp|llm)\b',
-        r'\b(?:tensorflow|pytorch|scikit-learn|pandas|numpy|fastapi|langchain)\b',
-        r'\b(?:rag|retrieval|augmented|generation|vector|embedding|transformer)\b',
-        r'\b(?:sagemaker|hugging face|pinecone|faiss|chroma|mlops)\b',
-        r'\b(?:prompt engineering|fine-tuning|lora|peft|agentic)\b'
-    ]
+    Returns None for a language with no configured or installed model; the
+    caller then extracts technical terms only. A missing English model is
+    fatal unless required is False.
+    """
+    global _fallback_model
+    config = get_config()
+    _pipelines.max_models = config.max_loaded_models
+    model_name = model_for_language(language, config)
+    if model_name is None:
+        return None
+
+    first_failure = model_name not in _pipelines.missing
+    try:
+        nlp = _pipelines.get(model_name)
+    except OSError:
+        if model_name != config.spacy_model:
+            if first_failure:
+                print(f"⚠ SpaCy model '{model_name}' not installed - using technical terms only for '{language}'")
+            return None
+        if _fallback_model is None:
+            return load_spacy_model(model_name) if required else None
+        if first_failure:
+            print(f"⚠ SpaCy model '{model_name}' not found - still using '{_fallback_model}'")
+        return _pipelines.get(_fallback_model)
+
+    if model_name == config.spacy_model:
+        _fallback_model = model_name
+    return nlp
+
+
+TECH_PATTERNS = [re.compile(pattern) for pattern in [
+    r'\b(?:python|java|javascript|react|node\.?js|aws|docker|kubernetes|sql|nosql)\b',
+    r'\b(?:machine learning|deep learning|ai|artificial intelligence|nlp|llm)\b',
+    r'\b(?:tensorflow|pytorch|scikit-learn|pandas|numpy|fastapi|langchain)\b',
+    r'\b(?:rag|retrieval|augmented|generation|vector|embedding|transformer)\b',
+    r'\b(?:sagemaker|hugging face|pinecone|faiss|chroma|mlops)\b',
+    r'\b(?:prompt engineering|fine-tuning|lora|peft|agentic)\b'
+]]
+
+# Chunks buffered by nlp.pipe at once; keeps peak memory near a few chunks
+PIPE_BATCH_SIZE = 4
+
+KEY_PHRASES = [
+    'machine learning', 'deep learning', 'natural language processing',
+    'retrieval augmented generation', 'large language models',
+    'prompt engineering', 'vector databases', 'generative ai',
+    'artificial intelligence', 'data science', 'cloud computing'
+]
+
+
+def extract_weighted_keywords(jd_text, max_keywords=None, language=None):
+    """Extract and rank keywords with their score, strongest section and source
+
+    The job description is split into sections first; boilerplate sections
+    (about us, benefits) are skipped before the spaCy pass and every other
+    section scales its keyword scores by its section weight. Long sections
+    are processed as bounded chunks and their counts merged.
+
+    The language is detected first (unless given) and the job description is
+    parsed with that language's pipeline; without one only technical terms
+    and key phrases are scored, so no model parse is wasted on it.
+    """
+    config = get_config()
+    if max_keywords is None:
+        max_keywords = config.max_keywords
+    if language is None:
+        language = detect_language(jd_text) if config.language_detection else DEFAULT_LANGUAGE
+    nlp = get_nlp(language)
+    key_phrases = phrases_for_language(language, KEY_PHRASES)
 
     keywords = {}
+    contributions = {}
+    phrase_sections = {}
+
+    def add(keyword, points, section, source):
+        weighted = points * section_weight(section)
+        keywords[keyword] = keywords.get(keyword, 0) + weighted
+        by_key = contributions.setdefault(keyword, {})
+        by_key[(section, source)] = by_key.get((section, source), 0) + weighted
+
+    def score_chunks(chunks):
+        scored = 0
+        lowered = ((chunk.lower(), section) for section, chunk in chunks)
+        if nlp is None:
+            docs = ((None, text, section) for text, section in lowered)
+        else:
+            docs = ((doc, doc.text, section) for doc, section in
+                    nlp.pipe(lowered, as_tuples=True, batch_size=PIPE_BATCH_SIZE))
+        for doc, text, section in docs:
+            scored += 1
+            for pattern in TECH_PATTERNS:
+                for match in pattern.findall(text):
+                    add(match, config.tech_weight, section, 'tech')  # High weight for tech terms
+
+            if doc is not None:
+                # Extract named entities
+                for ent in doc.ents:
+                    if ent.label_ in ['ORG', 'PRODUCT', 'LANGUAGE', 'SKILL']:
+                        clean_text = ent.text.strip().lower()
+                        if len(clean_text) > 2:
+                            add(clean_text, config.entity_weight, section, 'entity')
+
+                for token in doc:
+                    if (token.pos_ in ['NOUN', 'PROPN'] and
+                            not token.is_stop and
+                            len(token.text) > 2 and
+                            token.text.isalpha()):
+                        add(token.text, config.noun_weight, section, 'noun')
+
+            for phrase in key_phrases:
+                if phrase in text:
+                    best = phrase_sections.get(phrase, section)
+                    phrase_sections[phrase] = max(best, section, key=section_weight)
+        return scored
+
+    # Chunks are streamed through spaCy, so memory is bounded by the chunk
+    # size rather than by the size of the job description
+    scored = score_chunks((section, chunk) for section, chunk in iter_section_chunks(jd_text)
+                          if not is_boilerplate(section))
+    if not scored:
+        score_chunks((OTHER, chunk) for _, chunk in iter_section_chunks(jd_text))
+
+    # Phrases count once, in the strongest section they appear in
+    for phrase, section in phrase_sections.items():
+        add(phrase, config.phrase_weight, section, 'phrase')
+
+    if config.deterministic:
+        # Equal scores are ordered alphabetically rather than by first appearance
+        sorted_keywords = sorted(keywords.items(), key=lambda x: (-round(x[1], 6), x[0]))
+    else:
+        sorted_keywords = sorted(keywords.items(), key=lambda x: x[1], reverse=True)
+    results = []
+    for keyword, score in sorted_keywords[:max_keywords]:
+        section, source = max(contributions[keyword].items(), key=lambda x: x[1])[0]
+        results.append({
+            'keyword': keyword,
+            'score': round(score, 2),
+            'section': section,
+            'source': source
+        })
+    return results
+
+
+def extract_smart_keywords(jd_text, max_keywords=None):
+    """Extract and rank keywords from job description with relevance scoring"""
+    return [kw['keyword'] for kw in extract_weighted_keywords(jd_text, max_keywords)]
 
-    for pattern in tech_patterns:
-        matches = re.findall(pattern, jd_text.lower())
-        for match in matches:
-            keywords[match] = keywords.get(match, 0) + 3  # High weight for tech terms
 
-    # Extract named entities
-    for ent in doc.ents:
-        if ent.label_ in ['ORG', 'PRODUCT', 'LANGUAGE', 'SKILL']:
-            clean_text = ent.text.strip().lower()
-            if len(clean_text) > 2:
-                keywords[clean_text] = keywords.get(clean_text, 0) + 2
+def keyword_metadata_fields(keywords):
+    """Split keywords across core metadata fields and custom properties
 
-    for token in doc:
-        if (token.pos_ in ['NOUN', 'PROPN'] and
-                not token.is_stop and
-                len(token.text) > 2 and
-                token.text.isalpha()):
-            keywords[token.text] = keywords.get(token.text, 0) + 1
+    Returns (core_fields, custom_properties); shared by both DOCX writers.
+    """
+    keywords_str = ', '.join(keywords)
 
-    phrases = [
-        'machine learning', 'deep learning', 'natural language processing',
-        'retrieval augmented generation', 'large language models',
-        'prompt engineering', 'vector databases', 'generative ai',
-        'artificial intelligence', 'data science', 'cloud computing'
-    ]
+    chunk_size = get_config().metadata_chunk_size
+    keyword_chunks = [keywords_str[i:i + chunk_size] for i in range(0, len(keywords_str), chunk_size)]
 
-    for phrase in phrases:
-        if phrase in jd_text.lower():
-            keywords[phrase] = keywords.get(phrase, 0) + 2
+    # Add to various metadata fields
+    core_fields = dict(zip(['keywords', 'comments', 'subject'], keyword_chunks))
 
-    sorted_keywords = sorted(keywords.items(), key=lambda x: x[1], reverse=True)
-    return [kw[0] for kw in sorted_keywords[:max_keywords]]
+    custom_properties = {
+        'ats_keywords': ', '.join(keywords[:20]),
+        'skills': ', '.join([kw for kw in keywords if any(tech in kw.lower()
+                                                          for tech in ['python', 'aws', 'ai', 'ml', 'data'])]),
+    }
+    return core_fields, custom_properties
 
 
 def add_keywords_to_metadata(doc, keywords):
     """Add keywords to multiple metadata fields for maximum ATS coverage"""
-    keywords_str = ', '.join(keywords)
-
-    chunk_size = 200
-    keyword_chunks = [keywords_str[i:i + chunk_size] for i in range(0, len(keywords_str), chunk_size)]
-
-    # Add to various metadata fields
-    if len(keyword_chunks) > 0:
-        doc.core_properties.keywords = keyword_chunks[0]
-    if len(keyword_chunks) > 1:
-        doc.core_properties.comments = keyword_chunks[1]
-    if len(keyword_chunks) > 2:
-        doc.core_properties.subject = keyword_chunks[2]
+    core_fields, custom_properties = keyword_metadata_fields(keywords)
+    for field, value in core_fields.items():
+        setattr(doc.core_properties, field, value)
 
     # Add to custom properties
     try:
         custom_props = doc.custom_properties
-        custom_props.add('ats_keywords', ', '.join(keywords[:20]))
-        custom_props.add('skills', ', '.join([kw for kw in keywords if any(tech in kw.lower()
-                                                                           for tech in
-                                                                           ['python', 'aws', 'ai', 'ml', 'data'])]))
+        for name, value in custom_properties.items():
+            custom_props.add(name, value)
     except:
         pass
 
 
 def add_hidden_text(paragraph, text):
     """Add completely hidden text (invisible to readers, readable by ATS)"""
+    from docx.oxml import OxmlElement
     run = paragraph.add_run(text)
     r = run._r
     rPr = r.get_or_add_rPr()
@@ -113,7 +230,7 @@ def add_hidden_text(paragraph, text):
 
 def add_white_text(paragraph, text):
     """Add white text on white background (invisible but searchable)"""
-    from docx.shared import Pt
+    from docx.shared import Pt, RGBColor
     run = paragraph.add_run(text)
     run.font.color.rgb = RGBColor(255, 255, 255)  # White text
     run.font.size = Pt(1)  # Tiny font size
@@ -146,6 +263,7 @@ def add_invisible_keywords_strategically(doc, keywords):
 def read_resume_text(docx_path):
     """Extract text content from resume docx file"""
     try:
+        import docx
         doc = docx.Document(docx_path)
         text = []
         for paragraph in doc.paragraphs:
@@ -156,25 +274,50 @@ def read_resume_text(docx_path):
         return ""
 
 
+def patch_invisible_keywords(docx_path, keywords, output_path):
+    """Write the optimized resume by patching its XML parts in place
+
+    Returns False (after a warning) when the package can't be patched, so
+    the caller can fall back to a full python-docx round trip.
+    """
+    from docx_patch import patch_docx_keywords
+    try:
+        core_fields, custom_properties = keyword_metadata_fields(keywords)
+        patch_docx_keywords(docx_path, output_path, keywords, core_fields, custom_properties,
+                            deterministic=get_config().deterministic)
+    except Exception as e:
+        print(f"⚠ In-place DOCX patch failed ({e}) - falling back to python-docx")
+        return False
+    print("✓ Keywords added to document metadata")
+    print(f"✓ {len(keywords)} keywords added as invisible text")
+    return True
+
+
 def inject_invisible_keywords(docx_path, keywords, output_path, pdf_output_path=None):
     """Main function to inject keywords using multiple invisible strategies"""
     try:
-        doc = docx.Document(docx_path)
-
         print(f"Processing {len(keywords)} keywords...")
 
-        add_keywords_to_metadata(doc, keywords)
-        print("✓ Keywords added to document metadata")
+        if not (get_config().docx_writer == 'patch' and patch_invisible_keywords(docx_path, keywords, output_path)):
+            import docx
+            doc = docx.Document(docx_path)
+
+            add_keywords_to_metadata(doc, keywords)
+            print("✓ Keywords added to document metadata")
 
-        keywords_added = add_invisible_keywords_strategically(doc, keywords)
-        print(f"✓ {keywords_added} keywords added as invisible text")
+            keywords_added = add_invisible_keywords_strategically(doc, keywords)
+            print(f"✓ {keywords_added} keywords added as invisible text")
 
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        doc.save(output_path)
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            doc.save(output_path)
+            if get_config().deterministic:
+                from docx_patch import normalize_docx
+                normalize_docx(output_path)
         print(f"✓ ATS-optimized DOCX resume saved: '{output_path}'")
 
         if pdf_output_path:
             try:
+                from docx2pdf import convert
                 convert(output_path, pdf_output_path)
                 if os.path.exists(pdf_output_path):
                     print(f"✓ PDF version created: '{pdf_output_path}'")
@@ -196,14 +339,23 @@ def inject_invisible_keywords(docx_path, keywords, output_path, pdf_output_path=
         return False
 
 
-def analyze_job_description(jd_text):
+def analyze_job_description(jd_text, return_weights=False):
     """Analyze job description and provide insights"""
-    keywords = extract_smart_keywords(jd_text)
+    weighted = extract_weighted_keywords(jd_text)
+    keywords = [kw['keyword'] for kw in weighted]
 
     print("\n📊 Job Description Analysis:")
+    if get_config().language_detection:
+        print(f"   • Language: {detect_language(jd_text)}")
     print(f"   • Total keywords extracted: {len(keywords)}")
     print(f"   • Top 10 keywords: {', '.join(keywords[:10])}")
 
+    sections = Counter(section for section, _ in iter_sections(jd_text))
+    if set(sections) != {OTHER}:
+        section_info = [f"{section} ({'skipped' if is_boilerplate(section) else f'x{section_weight(section)}'})"
+                        for section in sections]
+        print(f"   • Sections: {', '.join(section_info)}")
+
     tech_skills = [kw for kw in keywords if any(tech in kw.lower()
                                                 for tech in
                                                 ['python', 'aws', 'ai', 'ml', 'docker', 'kubernetes', 'sql'])]
@@ -216,15 +368,32 @@ def analyze_job_description(jd_text):
     if soft_skills:
         print(f"   • Soft skills: {', '.join(soft_skills[:3])}")
 
+    if return_weights:
+        return keywords, weighted
     return keywords
 
 
-def extract_missing_keywords_llm(jd_text, resume_text, max_keywords=50):
+def extract_missing_keywords_llm(jd_text, resume_text, max_keywords=None, priority=PRIORITY_BATCH,
+                                 return_source=False, debug_dir='.'):
     """
     Use a free LLM API to extract the most important keywords from the job description
     that are NOT present in the resume. Returns a list of missing keywords.
+    Requests go through the shared scheduler, so a batch never exceeds the
+    provider's request and token quotas; interactive callers pass
+    PRIORITY_INTERACTIVE to jump the queue.
+    With return_source, returns (keywords, source) where source is 'llm' or
+    'fallback' (no token, API error or unusable response).
+    The prompt and raw response are written to debug_dir for inspection;
+    concurrent callers pass their own directory, or None to skip them.
     """
-    API_URL = "https://router.huggingface.co/v1/chat/completions"
+    config = get_config()
+    if max_keywords is None:
+        max_keywords = config.max_keywords
+
+    def fallback():
+        keywords = extract_fallback_keywords(jd_text, resume_text, max_keywords)
+        return (keywords, 'fallback') if return_source else keywords
+
     hf_token = os.environ.get("HF_TOKEN")
     print("[DEBUG] HF_TOKEN in env:", "✓ Found" if hf_token else "✗ Not found")
 
@@ -233,35 +402,50 @@ def extract_missing_keywords_llm(jd_text, resume_text, max_keywords=50):
         print("[LLM API] Please add HF_TOKEN to your .env file or set as environment variable.")
         print(
             "[LLM API] TIP: Make sure you export HF_TOKEN in the same shell session and run the script from that shell. Try: export HF_TOKEN=your_token && python ats_cli.py")
-        return extract_fallback_keywords(jd_text, resume_text, max_keywords)
+        return fallback()
 
     headers = {"Authorization": f"Bearer {hf_token}"}
 
-    prompt = LLM_KEYWORD_EXTRACTION_PROMPT.format(jd_text=jd_text.strip(), resume_text=resume_text.strip())
+    prompt = LLM_KEYWORD_EXTRACTION_PROMPT.format(jd_text=condense_job_description(jd_text).strip(),
+                                                  resume_text=resume_text.strip())
 
     # Export prompt to file for debugging
-    with open("debug_prompt.txt", "w", encoding='utf-8') as f:
-        f.write(prompt)
-    print("[LLM API] Detailed ATS prompt written to debug_prompt.txt")
+    if debug_dir is not None:
+        debug_prompt = os.path.join(debug_dir, "debug_prompt.txt")
+        with open(debug_prompt, "w", encoding='utf-8') as f:
+            f.write(prompt)
+        print(f"[LLM API] Detailed ATS prompt written to {debug_prompt}")
 
     payload = {
         "messages": [
             {"role": "user", "content": prompt}
         ],
-        "model": "moonshotai/Kimi-K2-Instruct-0905:groq",
-        "temperature": 0.1,
-        "max_tokens": 500
+        "model": config.llm_model,
+        "temperature": config.llm_temperature,
+        "max_tokens": config.llm_max_tokens
     }
 
+    def send_request():
+        import requests
+        response = requests.post(config.llm_api_url, headers=headers, json=payload, timeout=config.llm_timeout)
+        if response.status_code == 429:
+            retry_after = response.headers.get("Retry-After")
+            raise RateLimitError(f"429 from {config.llm_api_url}",
+                                 float(retry_after) if retry_after and retry_after.isdigit() else None)
+        response.raise_for_status()
+        return response.json()
+
     try:
         print("[LLM API] Sending request to HuggingFace API...")
-        response = requests.post(API_URL, headers=headers, json=payload, timeout=60)
-        response.raise_for_status()
-        result = response.json()
+        scheduler = get_scheduler()
+        result = scheduler.run(send_request, estimate_tokens(prompt, config.llm_max_tokens), priority)
+        print(f"[LLM API] Scheduler: {format_metrics(scheduler.metrics())}")
 
-        with open("debug_response.json", "w", encoding='utf-8') as f:
-            json.dump(result, f, indent=2)
-        print("[LLM API] Response written to debug_response.json")
+        if debug_dir is not None:
+            debug_response = os.path.join(debug_dir, "debug_response.json")
+            with open(debug_response, "w", encoding='utf-8') as f:
+                json.dump(result, f, indent=2)
+            print(f"[LLM API] Response written to {debug_response}")
 
         if isinstance(result, dict) and 'choices' in result and len(result['choices']) > 0:
             content = result['choices'][0]['message']['content'].strip()
@@ -281,34 +465,100 @@ def extract_missing_keywords_llm(jd_text, resume_text, max_keywords=50):
             keywords = [kw for kw in keywords if len(kw) > 1 and not kw.lower().startswith(('note:', 'here'))]
 
             print(f"[LLM API] Extracted {len(keywords)} keywords: {', '.join(keywords[:10])}...")
-            return keywords[:max_keywords]
+            # The LLM still reports synonyms of resume skills ("k8s" vs "kubernetes")
+            keywords = missing_from_resume(keywords, resume_text)
+            return (keywords[:max_keywords], 'llm') if return_source else keywords[:max_keywords]
         else:
             print(f"[LLM API] Unexpected response format: {result}")
-            return extract_fallback_keywords(jd_text, resume_text, max_keywords)
+            return fallback()
 
     except Exception as e:
         print(f"[LLM API] Error extracting keywords: {e}")
         print("[LLM API] Falling back to local keyword extraction...")
-        return extract_fallback_keywords(jd_text, resume_text, max_keywords)
+        return fallback()
+
 
+def missing_from_resume(keywords, resume_text, use_nlp=False):
+    """Return the keywords not found in the resume text, in rank order
+
+    A keyword counts as found if it appears verbatim (case insensitive) or as
+    a lemma of a resume word or, with semantic matching on, if a synonym or
+    near-identical spelling does. The resume is analysed once per distinct
+    text (resume_analysis.py), not once per job. use_nlp lemmatizes it with
+    spaCy; callers that have not loaded spaCy (the LLM path) leave it off.
+    """
+    from resume_analysis import get_resume_analysis
+    analysis = get_resume_analysis(resume_text, use_nlp)
+    missing = [keyword for keyword in dict.fromkeys(keywords) if not analysis.contains(keyword)]
 
-def extract_fallback_keywords(jd_text, resume_text, max_keywords=50):
+    config = get_config()
+    if config.semantic_matching and missing:
+        from semantic_matcher import semantic_missing
+        missing = semantic_missing(missing, resume_text, config.semantic_match_threshold,
+                                   terms=analysis.ngrams)
+    return missing
+
+
+def extract_fallback_keywords(jd_text, resume_text, max_keywords=None):
     """Fallback keyword extraction when LLM API is not available"""
+    if max_keywords is None:
+        max_keywords = get_config().max_keywords
     print("[FALLBACK] Using local keyword extraction...")
-    jd_keywords = set(extract_smart_keywords(jd_text, max_keywords * 2))
-
-    # Simple check for keywords not in resume (case insensitive)
-    resume_lower = resume_text.lower()
-    missing_keywords = []
+    jd_keywords = extract_smart_keywords(jd_text, max_keywords * 2)
 
-    for keyword in jd_keywords:
-        if keyword.lower() not in resume_lower:
-            missing_keywords.append(keyword)
+    missing_keywords = missing_from_resume(jd_keywords, resume_text, use_nlp=True)
 
     print(f"[FALLBACK] Found {len(missing_keywords)} missing keywords")
     return missing_keywords[:max_keywords]
 
 
+# Distinct recognised tech terms at which the local result counts as fully covered
+CONFIDENT_TECH_TERMS = 8
+
+
+def local_extraction_confidence(weighted):
+    """Score 0-1 for how well the local extractor understood a job description
+
+    Half comes from how many distinct known tech terms and phrases were found,
+    half from the share of the total score they carry. A JD dominated by
+    generic nouns (an unfamiliar domain, odd formatting) scores low.
+    """
+    if not weighted:
+        return 0.0
+    known = [kw for kw in weighted if kw['source'] in ('tech', 'phrase')]
+    total = sum(kw['score'] for kw in weighted)
+    coverage = min(1.0, len(known) / CONFIDENT_TECH_TERMS)
+    share = sum(kw['score'] for kw in known) / total if total else 0.0
+    return round(0.5 * coverage + 0.5 * share, 3)
+
+
+def extract_local_missing_keywords(jd_text, resume_text, max_keywords=None, return_weights=False):
+    """Run the local extractor and return (missing keywords, confidence)
+
+    With return_weights, the weighted keywords of the whole job description
+    are returned as a third item.
+    """
+    if max_keywords is None:
+        max_keywords = get_config().max_keywords
+    weighted = extract_weighted_keywords(jd_text, max_keywords * 2)
+    missing = missing_from_resume([kw['keyword'] for kw in weighted], resume_text, use_nlp=True)
+    if return_weights:
+        return missing[:max_keywords], local_extraction_confidence(weighted), weighted
+    return missing[:max_keywords], local_extraction_confidence(weighted)
+
+
+def plan_llm_escalations(confidences, threshold=None, budget=None):
+    """Pick which jobs go to the LLM: the least confident ones below threshold, up to budget
+
+    confidences maps a job key to its local confidence; returns a set of keys.
+    """
+    config = get_config()
+    threshold = config.hybrid_confidence_threshold if threshold is None else threshold
+    budget = config.hybrid_llm_budget if budget is None else budget
+    candidates = sorted((conf, key) for key, conf in confidences.items() if conf < threshold)
+    return {key for _, key in candidates[:max(budget, 0)]}
+
+
 def main():
     """Main execution function"""
     print("🚀 Smart ATS Resume Optimizer")
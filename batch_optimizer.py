@@ -5,9 +5,17 @@ Process multiple job descriptions at once
 """
 
 import os
+import sys
 import json
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from ats_optimizer import analyze_job_description, inject_invisible_keywords, extract_missing_keywords_llm
+from ats_config import get_config
+from batch_progress import ProgressReporter, categorize_error
+from output_store import OutputStore, file_digest, job_key
+from ats_optimizer import analyze_job_description, inject_invisible_keywords, extract_missing_keywords_llm, extract_local_missing_keywords, plan_llm_escalations
+from skills_section import SKILLS_ALLOWLIST_FILE, load_skill_allowlist, match_allowed_skills, save_with_skills_section
 
 def create_job_batch():
     """Create a batch of job descriptions"""
@@ -67,85 +75,244 @@ def select_strategy():
     print("\nKeyword Extraction Strategy:")
     print("1. Default (spaCy-based, current)")
     print("2. LLM-based (extract only missing, important keywords)")
-    choice = input("Select strategy (1-2, default 1): ").strip()
+    print("3. Hybrid (spaCy for every job, LLM only where spaCy looks unsure)")
+    choice = input("Select strategy (1-3, default 1): ").strip()
     if choice == "2":
         return "llm-keyword-inject"
+    if choice == "3":
+        return "hybrid"
     return "default"
 
-def process_batch(jobs, resume_file, strategy="default"):
-    """Process all jobs in batch"""
+def select_output_mode():
+    print("\nOutput Mode:")
+    print("1. Invisible keywords (metadata, hidden and white text)")
+    print(f"2. Visible 'Relevant Skills' section (only skills in {SKILLS_ALLOWLIST_FILE})")
+    choice = input("Select output mode (1-2, default 1): ").strip()
+    if choice == "2":
+        return "visible-skills"
+    return "invisible"
+
+def process_batch(jobs, resume_file, strategy="default", output_mode="invisible", workers=None):
+    """Process all jobs in batch
+
+    With workers > 1 (default: batch_workers from the config) jobs run in a
+    thread pool; progress telemetry works the same either way.
+    """
     if not jobs:
         print("❌ No jobs to process!")
         return
     
+    config = get_config()
+    workers = max(1, workers or config.batch_workers)
+    
+    # The allow-list is the candidate's confirmation for every job in the batch
+    allowlist = {}
+    if output_mode == "visible-skills":
+        allowlist = load_skill_allowlist()
+        if not allowlist:
+            print(f"❌ {SKILLS_ALLOWLIST_FILE} not found or empty!")
+            return
+    
     print(f"\n🔄 Processing {len(jobs)} job applications...")
     
+    # Deterministic mode: look every job up in the content-addressed store
+    # first, and name the batch after its inputs so reruns land in one place
+    store = None
+    job_keys = {}
+    cached = {}
+    if config.deterministic:
+        store = OutputStore(config.output_store)
+        resume_digest = file_digest(resume_file)
+        extra = {'resume_name': os.path.basename(resume_file), 'allowlist': sorted(allowlist.values())}
+        for i, job in enumerate(jobs, 1):
+            job_keys[i] = job_key(resume_digest, job['description'], strategy, output_mode, config, extra)
+            manifest = store.get(job_keys[i])
+            if manifest is not None:
+                cached[i] = manifest
+        if cached:
+            print(f"   ♻️  {len(cached)}/{len(jobs)} jobs already in the output store")
+        batch_hash = hashlib.sha256(''.join(job_keys.values()).encode('utf-8')).hexdigest()
+        batch_dir = f"batch_optimized_{batch_hash[:12]}"
+    else:
+        batch_dir = f"batch_optimized_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        # Batches started within the same second must not share a directory
+        base_dir, n = batch_dir, 1
+        while os.path.exists(batch_dir):
+            n += 1
+            batch_dir = f"{base_dir}_{n}"
+    
     # Create batch output directory
-    batch_dir = f"batch_optimized_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
     os.makedirs(batch_dir, exist_ok=True)
     
-    results = []
+    progress = ProgressReporter(len(jobs), view=config.progress_view,
+                                jsonl_path=f"{batch_dir}/progress.jsonl")
     
-    # Read resume text once if LLM strategy
+    # Read resume text once if LLM or hybrid strategy
     resume_text = None
-    if strategy == "llm-keyword-inject":
+    if strategy in ("llm-keyword-inject", "hybrid"):
         import docx
         doc = docx.Document(resume_file)
         resume_text = "\n".join([p.text for p in doc.paragraphs])
     
-    for i, job in enumerate(jobs, 1):
+    # Hybrid: run the fast local extractor on every job first, then spend the
+    # LLM budget on the jobs it understood worst
+    local_results = {}
+    jd_keywords = {}
+    escalate = set()
+    if strategy == "hybrid":
+        print("\n⚡ Running local extraction on every job...")
+        for i, job in enumerate(jobs, 1):
+            if i in cached:
+                continue
+            try:
+                with progress.stage(i, 'local'):
+                    missing, confidence, weighted = extract_local_missing_keywords(
+                        job['description'], resume_text, return_weights=True)
+                local_results[i] = (missing, confidence)
+                jd_keywords[i] = [kw['keyword'] for kw in weighted[:config.max_keywords]]
+            except Exception as e:
+                print(f"   ⚠ Local extraction failed for {job['company']}: {e}")
+                local_results[i] = ([], 0.0)
+        escalate = plan_llm_escalations({i: conf for i, (_, conf) in local_results.items()})
+        print(f"   🤖 {len(escalate)}/{len(local_results)} low-confidence jobs will use the LLM")
+    
+    # Parse the resume once per worker thread; each job adds its section,
+    # saves, then removes it, so a parsed document is never shared
+    resume_docs = threading.local()
+    
+    def get_resume_doc():
+        if not hasattr(resume_docs, 'doc'):
+            import docx
+            resume_docs.doc = docx.Document(resume_file)
+        return resume_docs.doc
+    
+    def run_job(i, job):
         print(f"\n📋 Processing {i}/{len(jobs)}: {job['company']} - {job['position']}")
+        started_at = progress.job_started(i)
+        
+        # Create job-specific output files
+        safe_company = "".join(c for c in job['company'] if c.isalnum() or c in (' ', '-', '_')).strip()
+        safe_position = "".join(c for c in job['position'] if c.isalnum() or c in (' ', '-', '_')).strip()
+        job_dir = f"{batch_dir}/{safe_company}_{safe_position}".replace(' ', '_')
         
         try:
-            if strategy == "llm-keyword-inject":
-                keywords = extract_missing_keywords_llm(job['description'], resume_text)
-                print(f"   🔑 LLM-extracted missing keywords: {', '.join(keywords[:10])}")
-            else:
-                keywords = analyze_job_description(job['description'])
-            
-            # Create job-specific output files
-            safe_company = "".join(c for c in job['company'] if c.isalnum() or c in (' ', '-', '_')).strip()
-            safe_position = "".join(c for c in job['position'] if c.isalnum() or c in (' ', '-', '_')).strip()
+            if i in cached:
+                with progress.stage(i, 'store'):
+                    restored = store.restore(cached[i], job_dir)
+                print(f"   ♻️  Served from output store ({job_keys[i][:12]}): {', '.join(restored)}")
+                result = dict(cached[i]['result'], company=job['company'], position=job['position'],
+                              output_dir=job_dir, cached=True)
+                progress.job_finished(i, started_at, result['success'])
+                return result
             
-            job_dir = f"{batch_dir}/{safe_company}_{safe_position}".replace(' ', '_')
+            # Workers share the CWD, so LLM debug files go in the job's own directory
             os.makedirs(job_dir, exist_ok=True)
+            weighted = None
+            extraction = 'local'
+            with progress.stage(i, 'extract'):
+                if strategy == "llm-keyword-inject":
+                    keywords, extraction = extract_missing_keywords_llm(job['description'], resume_text,
+                                                                        return_source=True, debug_dir=job_dir)
+                    print(f"   🔑 LLM-extracted missing keywords: {', '.join(keywords[:10])}")
+                elif strategy == "hybrid":
+                    keywords, confidence = local_results[i]
+                    if i in escalate:
+                        print(f"   🤖 Local confidence {confidence:.2f} - escalating to LLM")
+                        keywords, extraction = extract_missing_keywords_llm(job['description'], resume_text,
+                                                                            return_source=True, debug_dir=job_dir)
+                    else:
+                        print(f"   ⚡ Local confidence {confidence:.2f} - keeping local keywords")
+                    print(f"   🔑 Missing keywords: {', '.join(keywords[:10])}")
+                else:
+                    keywords, weighted = analyze_job_description(job['description'], return_weights=True)
+                    jd_keywords[i] = keywords
             
             base_name = os.path.splitext(resume_file)[0]
             output_docx = f"{job_dir}/{base_name}_ATS_Optimized.docx"
             output_pdf = f"{job_dir}/{base_name}_ATS_Optimized.pdf"
             
             # Process resume
-            success = inject_invisible_keywords(resume_file, keywords, output_docx, output_pdf)
+            with progress.stage(i, 'write'):
+                if output_mode == "visible-skills":
+                    skills = match_allowed_skills(keywords, allowlist)
+                    success = bool(skills)
+                    if success:
+                        save_with_skills_section(get_resume_doc(), skills, output_docx, output_pdf)
+                        print(f"   🧾 Relevant skills: {', '.join(skills)}")
+                    else:
+                        print(f"   ⚠ No allow-listed skills matched this job")
+                    with open(f"{job_dir}/relevant_skills.txt", 'w', encoding='utf-8') as f:
+                        f.write('\n'.join(skills))
+                else:
+                    success = inject_invisible_keywords(resume_file, keywords, output_docx, output_pdf)
             
-            # Save job description for reference
-            with open(f"{job_dir}/job_description.txt", 'w', encoding='utf-8') as f:
-                f.write(job['description'])
-            
-            # Save keywords for reference
-            with open(f"{job_dir}/extracted_keywords.txt", 'w', encoding='utf-8') as f:
-                f.write('\n'.join(keywords))
+            with progress.stage(i, 'save'):
+                # Save job description for reference
+                with open(f"{job_dir}/job_description.txt", 'w', encoding='utf-8') as f:
+                    f.write(job['description'])
+                
+                # Save keywords for reference
+                with open(f"{job_dir}/extracted_keywords.txt", 'w', encoding='utf-8') as f:
+                    f.write('\n'.join(keywords))
+                
+                # Everything the JD asks for, for the market skill report. The
+                # LLM and hybrid strategies inject only what the resume lacks,
+                # so extracted_keywords.txt understates skills already on it;
+                # pure LLM jobs have no local list and are left out
+                if i in jd_keywords:
+                    with open(f"{job_dir}/jd_keywords.txt", 'w', encoding='utf-8') as f:
+                        f.write('\n'.join(jd_keywords[i]))
+                
+                # Save per-keyword scores and the section they came from
+                if weighted:
+                    with open(f"{job_dir}/keyword_weights.json", 'w', encoding='utf-8') as f:
+                        json.dump(weighted, f, indent=2, ensure_ascii=False)
             
-            results.append({
+            result = {
                 'company': job['company'],
                 'position': job['position'],
                 'success': success,
                 'keywords_count': len(keywords),
                 'output_dir': job_dir
-            })
+            }
+            if strategy == "hybrid":
+                result['local_confidence'] = local_results[i][1]
+            if strategy in ("llm-keyword-inject", "hybrid"):
+                result['extraction'] = extraction
+            
+            # A local fallback for a failed LLM call (no token, 429s, network)
+            # is not what the key promises; keep it out of the store so a
+            # later run retries the LLM
+            if store is not None and success and extraction != 'fallback':
+                store.put(job_keys[i], job_dir, {k: v for k, v in result.items()
+                                                 if k not in ('company', 'position', 'output_dir')})
             
             if success:
                 print(f"   ✅ Success - {len(keywords)} keywords embedded")
             else:
                 print(f"   ❌ Failed to process")
+            progress.job_finished(i, started_at, success)
+            return result
                 
         except Exception as e:
             print(f"   ❌ Error: {e}")
-            results.append({
+            progress.job_finished(i, started_at, False, e)
+            return {
                 'company': job['company'],
                 'position': job['position'],
                 'success': False,
-                'error': str(e)
-            })
+                'error': str(e),
+                'error_category': categorize_error(e)
+            }
+    
+    if workers > 1:
+        print(f"   🧵 Running with {workers} parallel workers")
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(run_job, range(1, len(jobs) + 1), jobs))
+    else:
+        results = [run_job(i, job) for i, job in enumerate(jobs, 1)]
+    
+    telemetry = progress.close()
     
     # Save batch results
     with open(f"{batch_dir}/batch_results.json", 'w', encoding='utf-8') as f:
@@ -155,11 +322,35 @@ def process_batch(jobs, resume_file, strategy="default"):
     successful = sum(1 for r in results if r['success'])
     print(f"\n🎉 Batch processing complete!")
     print(f"   ✅ Successful: {successful}/{len(jobs)}")
+    if cached:
+        print(f"   ♻️  Served from output store: {len(cached)}/{len(jobs)}")
+    print(f"   ⏱️  {telemetry['jobs_per_second']:.2f} jobs/s, p50 {telemetry['latency']['p50']:.2f}s, "
+          f"p95 {telemetry['latency']['p95']:.2f}s")
+    if telemetry['errors']:
+        print(f"   ⚠ Errors: {', '.join(f'{k} {v}' for k, v in sorted(telemetry['errors'].items()))}")
     print(f"   📁 Output directory: {batch_dir}")
     print(f"   📊 Results saved to: {batch_dir}/batch_results.json")
+    print(f"   📈 Progress log: {batch_dir}/progress.jsonl")
+    if strategy == "hybrid":
+        print(f"   🤖 LLM used for {len(escalate)}/{len(jobs)} jobs")
+    if strategy in ("llm-keyword-inject", "hybrid"):
+        from llm_scheduler import format_metrics, get_scheduler
+        print(f"   🤖 LLM scheduler: {format_metrics(get_scheduler().metrics())}")
+    
+    return results
+
+def print_help():
+    """Print usage without loading any heavy dependency"""
+    print(__doc__.strip())
+    print("\nUsage: python3.10 batch_optimizer.py [-h | --help]")
+    print("Runs interactively; all options are chosen from the menus.")
 
 def main():
     """Main batch processing function"""
+    if any(arg in ('-h', '--help') for arg in sys.argv[1:]):
+        print_help()
+        return
+    
     try:
         print("🎯 Batch ATS Resume Optimizer")
         print("=" * 40)
@@ -167,8 +358,9 @@ def main():
         print("1. Create new job batch")
         print("2. Load existing batch")
         print("3. Process existing job_batch.json")
+        print("4. Market skill report across all batches")
         
-        choice = input("\nSelect option (1-3): ").strip()
+        choice = input("\nSelect option (1-4): ").strip()
         
         if choice == "1":
             jobs = create_job_batch()
@@ -181,6 +373,10 @@ def main():
             jobs = load_batch(filename)
         elif choice == "3":
             jobs = load_batch()
+        elif choice == "4":
+            from keyword_analytics import run_analytics
+            run_analytics()
+            return
         else:
             print("❌ Invalid option!")
             return
@@ -217,7 +413,8 @@ def main():
         # Process batch
         if input(f"\nProcess {len(jobs)} jobs with {resume_file}? (y/n): ").lower().startswith('y'):
             strategy = select_strategy()
-            process_batch(jobs, resume_file, strategy)
+            output_mode = select_output_mode()
+            process_batch(jobs, resume_file, strategy, output_mode)
         
     except KeyboardInterrupt:
         print("\n\n👋 Goodbye!")
@@ -0,0 +1,287 @@
+# batch_progress.py
+"""
+Batch progress, ETA and throughput telemetry
+Tracks per-stage throughput and active jobs, rolling latency percentiles,
+error categories and ETA for a batch run. Renders a status panel on the
+console and appends machine-readable events to a JSON lines file. All
+methods are thread-safe, so sequential and parallel runs report the same way.
+"""
+
+import json
+import math
+import re
+import shutil
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+
+# Latencies kept per stage for the rolling percentiles
+LATENCY_WINDOW = 200
+
+VIEW_TTY = 'tty'
+VIEW_PLAIN = 'plain'
+VIEW_NONE = 'none'
+
+_ANSI = re.compile(r'\033\[[0-9;]*[A-Za-z]')
+
+
+def categorize_error(error):
+    """Map an exception (or None for a reported failure) to a coarse error category"""
+    if error is None:
+        return 'write_failed'
+    name = type(error).__name__
+    module = type(error).__module__ or ''
+    if name == 'RateLimitError':
+        return 'rate_limit'
+    if 'Timeout' in name:
+        return 'timeout'
+    if 'Connection' in name or module.startswith(('requests', 'urllib3', 'http')):
+        return 'network'
+    if name == 'BadZipFile' or module.startswith(('docx', 'lxml')):
+        return 'docx'
+    if isinstance(error, MemoryError):
+        return 'memory'
+    if isinstance(error, OSError):
+        return 'file'
+    if isinstance(error, (ValueError, KeyError, IndexError, TypeError)):
+        return 'data'
+    return 'other'
+
+
+class _PanelStream:
+    """Stand-in for sys.stdout that keeps the status panel below other output
+
+    Complete lines printed by the jobs (from any thread) are written above
+    the panel, which is then redrawn; partial lines wait for their newline.
+    """
+
+    def __init__(self, reporter):
+        self._reporter = reporter
+        self._stream = reporter.stream
+        self._pending = ''
+
+    def write(self, text):
+        with self._reporter._render_lock:
+            self._pending += text
+            if '\n' in self._pending:
+                complete, _, self._pending = self._pending.rpartition('\n')
+                self._reporter._write_above_panel(complete + '\n')
+        return len(text)
+
+    def flush(self):
+        self._stream.flush()
+
+    def detach(self):
+        """Write out any partial line and return the real stream"""
+        with self._reporter._render_lock:
+            if self._pending:
+                self._reporter._write_above_panel(self._pending + '\n')
+                self._pending = ''
+        return self._stream
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def _latency_summary(latencies):
+    values = sorted(latencies)
+    return {
+        'p50': round(percentile(values, 50), 3),
+        'p95': round(percentile(values, 95), 3),
+        'p99': round(percentile(values, 99), 3),
+    }
+
+
+class ProgressReporter:
+    """Collect and report batch telemetry
+
+    view is 'tty' (status panel), 'plain' (one summary line per job),
+    'none', or None to pick 'tty' when stdout is a terminal. The tty panel
+    is redrawn in place; while it writes to sys.stdout, everything else
+    printed until close() scrolls above it. Events are appended to
+    jsonl_path when it is given. total may be None when jobs arrive from a
+    stream of unknown length; ETA is then omitted.
+    """
+
+    def __init__(self, total=None, view=None, jsonl_path=None, stream=None, clock=time.monotonic):
+        self.total = total
+        self.stream = stream or sys.stdout
+        if view in (None, 'auto'):
+            view = VIEW_TTY if getattr(self.stream, 'isatty', lambda: False)() else VIEW_PLAIN
+        self.view = view
+        self.clock = clock
+        self.started = clock()
+        self._lock = threading.Lock()
+        self._jsonl = open(jsonl_path, 'a', encoding='utf-8') if jsonl_path else None
+        self._job_latencies = deque(maxlen=LATENCY_WINDOW)
+        self._stage_latencies = {}
+        self._stage_active = Counter()
+        self._stage_done = Counter()
+        self._errors = Counter()
+        self._started_jobs = 0
+        self._succeeded = 0
+        self._failed = 0
+        self._render_lock = threading.RLock()
+        self._panel = []
+        self._stdout = None
+        if self.view == VIEW_TTY and self.stream is sys.stdout:
+            self._stdout = sys.stdout = _PanelStream(self)
+        self._emit({'event': 'batch_start', 'total': total})
+
+    def _emit(self, event):
+        if self._jsonl is None:
+            return
+        event = dict(event, t=round(self.clock() - self.started, 3), ts=time.time())
+        self._jsonl.write(json.dumps(event, ensure_ascii=False) + '\n')
+        self._jsonl.flush()
+
+    def job_started(self, job_id):
+        """Mark a job as started and return its start time for job_finished"""
+        with self._lock:
+            self._started_jobs += 1
+            self._emit({'event': 'job_start', 'job': job_id})
+        return self.clock()
+
+    @contextmanager
+    def stage(self, job_id, name):
+        """Time one stage of a job; active counts show how many jobs are in each stage"""
+        with self._lock:
+            self._stage_active[name] += 1
+        start = self.clock()
+        try:
+            yield
+        finally:
+            elapsed = self.clock() - start
+            with self._lock:
+                self._stage_active[name] -= 1
+                self._stage_done[name] += 1
+                self._stage_latencies.setdefault(name, deque(maxlen=LATENCY_WINDOW)).append(elapsed)
+                self._emit({'event': 'stage', 'job': job_id, 'stage': name, 'seconds': round(elapsed, 4)})
+
+    def job_finished(self, job_id, started_at, success, error=None):
+        """Record a finished job, its latency and (on failure) its error category"""
+        latency = self.clock() - started_at
+        with self._lock:
+            self._job_latencies.append(latency)
+            event = {'event': 'job_end', 'job': job_id, 'success': success, 'seconds': round(latency, 4)}
+            if success:
+                self._succeeded += 1
+            else:
+                self._failed += 1
+                category = categorize_error(error)
+                self._errors[category] += 1
+                event['error_category'] = category
+                if error is not None:
+                    event['error'] = str(error)
+            self._emit(event)
+            snapshot = self._snapshot()
+        self._render(snapshot)
+        return snapshot
+
+    def _snapshot(self):
+        elapsed = max(self.clock() - self.started, 1e-9)
+        done = self._succeeded + self._failed
+        rate = done / elapsed
+        remaining = None if self.total is None else max(self.total - done, 0)
+        stages = {}
+        for name in list(self._stage_done) + [n for n in self._stage_active if n not in self._stage_done]:
+            stages[name] = dict(
+                active=self._stage_active[name],
+                done=self._stage_done[name],
+                per_second=round(self._stage_done[name] / elapsed, 3),
+                **_latency_summary(self._stage_latencies.get(name, ()))
+            )
+        return {
+            'done': done,
+            'total': self.total,
+            'succeeded': self._succeeded,
+            'failed': self._failed,
+            'in_progress': self._started_jobs - done,
+            'elapsed_seconds': round(elapsed, 2),
+            'jobs_per_second': round(rate, 3),
+            'eta_seconds': round(remaining / rate, 1) if remaining is not None and rate > 0 else None,
+            'latency': _latency_summary(self._job_latencies),
+            'stages': stages,
+            'errors': dict(self._errors),
+        }
+
+    def snapshot(self):
+        """Current telemetry as a plain dict"""
+        with self._lock:
+            return self._snapshot()
+
+    def _render(self, snapshot):
+        if self.view == VIEW_NONE:
+            return
+        total = snapshot['total'] if snapshot['total'] is not None else '?'
+        eta = snapshot['eta_seconds']
+        eta_text = f"{eta:.0f}s" if eta is not None else '-'
+        latency = snapshot['latency']
+        summary = (f"{snapshot['done']}/{total} done, {snapshot['failed']} failed, "
+                   f"{snapshot['jobs_per_second']:.2f} jobs/s, ETA {eta_text}, "
+                   f"p50 {latency['p50']:.2f}s p95 {latency['p95']:.2f}s")
+
+        if self.view == VIEW_PLAIN:
+            self.stream.write(f"   📈 {summary}\n")
+            self.stream.flush()
+            return
+
+        bold, dim, reset = '\033[1m', '\033[2m', '\033[0m'
+        lines = [f"{bold}📈 Progress{reset}  {self._bar(snapshot)}  {summary}"]
+        for name, stage in snapshot['stages'].items():
+            lines.append(f"   {name:<10} active {stage['active']:>3}  done {stage['done']:>5}  "
+                         f"{stage['per_second']:>6.2f}/s  p50 {stage['p50']:.2f}s  "
+                         f"p95 {stage['p95']:.2f}s  p99 {stage['p99']:.2f}s")
+        if snapshot['errors']:
+            errors = ', '.join(f"{name} {count}" for name, count in sorted(snapshot['errors'].items()))
+            lines.append(f"   {dim}errors: {errors}{reset}")
+        # A wrapped line would throw off the cursor movement, so lines are cut to the terminal
+        width = shutil.get_terminal_size().columns - 2
+        lines = [line if len(_ANSI.sub('', line)) <= width else _ANSI.sub('', line)[:width] for line in lines]
+        with self._render_lock:
+            self.stream.write(self._erase_panel() + '\n'.join(lines) + '\n')
+            self.stream.flush()
+            self._panel = lines
+
+    def _erase_panel(self):
+        """Escape codes that move to the top of the drawn panel and clear it"""
+        return f"\033[{len(self._panel)}F\033[J" if self._panel else ''
+
+    def _write_above_panel(self, text):
+        with self._render_lock:
+            if not self._panel:
+                self.stream.write(text)
+                return
+            self.stream.write(self._erase_panel() + text + '\n'.join(self._panel) + '\n')
+            self.stream.flush()
+
+    @staticmethod
+    def _bar(snapshot, width=20):
+        if not snapshot['total']:
+            return ''
+        filled = int(width * snapshot['done'] / snapshot['total'])
+        return '[' + '█' * filled + '·' * (width - filled) + ']'
+
+    def close(self):
+        """Write the final summary event, restore stdout and close the JSON lines file"""
+        if self._stdout is not None:
+            if sys.stdout is self._stdout:
+                sys.stdout = self._stdout.detach()
+            self._stdout = None
+        with self._lock:
+            snapshot = self._snapshot()
+            self._emit(dict(snapshot, event='batch_end'))
+            if self._jsonl is not None:
+                self._jsonl.close()
+                self._jsonl = None
+        return snapshot
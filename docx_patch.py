@@ -0,0 +1,319 @@
+# docx_patch.py
+"""
+Zero-reparse DOCX patching
+Writes the invisible-keyword resume without loading it into python-docx.
+The source DOCX is treated as a zip of untouched byte blobs: every part that
+does not change (images, fonts, styles, headers...) is copied as its
+compressed bytes, and only word/document.xml, docProps/core.xml,
+docProps/custom.xml and the package relationship/content-type parts that
+reference them are rewritten.
+"""
+
+import os
+import struct
+import zlib
+import zipfile
+
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+CP_NS = 'http://schemas.openxmlformats.org/package/2006/metadata/core-properties'
+DC_NS = 'http://purl.org/dc/elements/1.1/'
+DCTERMS_NS = 'http://purl.org/dc/terms/'
+XSI_NS = 'http://www.w3.org/2001/XMLSchema-instance'
+CUSTOM_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/custom-properties'
+VT_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/docPropsVTypes'
+REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+CT_NS = 'http://schemas.openxmlformats.org/package/2006/content-types'
+XML_NS = 'http://www.w3.org/XML/1998/namespace'
+
+RT_OFFICE_DOCUMENT = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument'
+RT_CORE_PROPS = 'http://schemas.openxmlformats.org/package/2006/relationships/metadata/core-properties'
+RT_CUSTOM_PROPS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/custom-properties'
+CT_CORE_PROPS = 'application/vnd.openxmlformats-package.core-properties+xml'
+CT_CUSTOM_PROPS = 'application/vnd.openxmlformats-officedocument.custom-properties+xml'
+
+# Format id Word uses for user-defined custom properties
+CUSTOM_PROPS_FMTID = '{D5CDD505-2E9C-101B-9397-08002B2CF9AE}'
+
+# Timestamp for parts that did not exist in the source package, and for
+# every part in deterministic mode
+DEFAULT_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+_LOCAL_HEADER = struct.Struct('<4s5H3L2H')
+_CENTRAL_HEADER = struct.Struct('<4s6H3L5H2L')
+_END_RECORD = struct.Struct('<4s4H2LH')
+_ZIP32_LIMIT = 0xFFFFFFFF
+_FLAG_DATA_DESCRIPTOR = 0x08
+_FLAG_UTF8 = 0x800
+
+
+def _qn(ns, tag):
+    return f'{{{ns}}}{tag}'
+
+
+# --- Raw zip writing -------------------------------------------------------
+
+def _dos_date_time(date_time):
+    year, month, day, hour, minute, second = date_time
+    return ((hour << 11) | (minute << 5) | (second // 2),
+            ((year - 1980) << 9) | (month << 5) | day)
+
+
+def _read_raw(source, info):
+    """Return the still-compressed bytes of a zip entry"""
+    source.seek(info.header_offset)
+    header = source.read(30)
+    if header[:4] != b'PK\x03\x04':
+        raise zipfile.BadZipFile(f"Bad local header for {info.filename}")
+    name_length, extra_length = struct.unpack('<2H', header[26:30])
+    source.seek(info.header_offset + 30 + name_length + extra_length)
+    return source.read(info.compress_size)
+
+
+class RawZipWriter:
+    """Minimal zip writer that accepts pre-compressed entries as-is"""
+
+    def __init__(self, fileobj):
+        self.fp = fileobj
+        self.entries = []
+
+    def _write_entry(self, name, data, crc, file_size, compress_type, flags, date_time):
+        offset = self.fp.tell()
+        if max(offset, len(data), file_size) > _ZIP32_LIMIT or len(self.entries) >= 0xFFFF:
+            raise ValueError("Zip64 packages are not supported by the patch writer")
+        encoded = name.encode('utf-8')
+        flags = (flags & ~_FLAG_DATA_DESCRIPTOR) | (0 if name.isascii() else _FLAG_UTF8)
+        dos_time, dos_date = _dos_date_time(date_time)
+        self.fp.write(_LOCAL_HEADER.pack(b'PK\x03\x04', 20, flags, compress_type, dos_time, dos_date,
+                                         crc, len(data), file_size, len(encoded), 0))
+        self.fp.write(encoded)
+        self.fp.write(data)
+        self.entries.append((encoded, crc, len(data), file_size, compress_type, flags,
+                             dos_time, dos_date, offset))
+
+    def copy_raw(self, source, info, date_time=None):
+        """Copy an entry from an open source file without decompressing it"""
+        self._write_entry(info.filename, _read_raw(source, info), info.CRC, info.file_size,
+                          info.compress_type, info.flag_bits, date_time or info.date_time)
+
+    def write(self, name, payload, date_time=DEFAULT_DATE_TIME):
+        """Deflate and add a new or rewritten entry"""
+        compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+        data = compressor.compress(payload) + compressor.flush()
+        self._write_entry(name, data, zlib.crc32(payload), len(payload),
+                          zipfile.ZIP_DEFLATED, 0, date_time)
+
+    def close(self):
+        directory_offset = self.fp.tell()
+        for encoded, crc, size, file_size, compress_type, flags, dos_time, dos_date, offset in self.entries:
+            self.fp.write(_CENTRAL_HEADER.pack(b'PK\x01\x02', 20, 20, flags, compress_type, dos_time,
+                                               dos_date, crc, size, file_size, len(encoded), 0, 0, 0, 0,
+                                               0, offset))
+            self.fp.write(encoded)
+        directory_size = self.fp.tell() - directory_offset
+        self.fp.write(_END_RECORD.pack(b'PK\x05\x06', 0, 0, len(self.entries), len(self.entries),
+                                       directory_size, directory_offset, 0))
+
+
+# --- XML part edits --------------------------------------------------------
+
+def _part_name(target):
+    """Turn a package relationship target into a zip entry name"""
+    return target.lstrip('/')
+
+
+def _text_run(text, properties):
+    from lxml import etree
+    run = etree.Element(_qn(W_NS, 'r'))
+    rpr = etree.SubElement(run, _qn(W_NS, 'rPr'))
+    for tag, attrs in properties:
+        prop = etree.SubElement(rpr, _qn(W_NS, tag))
+        for key, value in attrs.items():
+            prop.set(_qn(W_NS, key), value)
+    t = etree.SubElement(run, _qn(W_NS, 't'))
+    t.text = text
+    t.set(_qn(XML_NS, 'space'), 'preserve')
+    return run
+
+
+HIDDEN_RUN = [('vanish', {})]
+WHITE_RUN = [('color', {'val': 'FFFFFF'}), ('sz', {'val': '2'})]
+
+
+def patch_document_xml(xml_bytes, keywords):
+    """Add the hidden paragraph and white-text runs placed by inject_invisible_keywords"""
+    from lxml import etree
+    root = etree.fromstring(xml_bytes)
+    body = root.find(_qn(W_NS, 'body'))
+
+    hidden = etree.Element(_qn(W_NS, 'p'))
+    hidden.append(_text_run(' '.join(keywords), HIDDEN_RUN))
+    sect_pr = body.find(_qn(W_NS, 'sectPr'))
+    if sect_pr is not None:
+        sect_pr.addprevious(hidden)
+    else:
+        body.append(hidden)
+
+    paragraphs = body.findall(_qn(W_NS, 'p'))
+    if len(paragraphs) > 3:
+        paragraphs[1].append(_text_run(' '.join(keywords[:10]), WHITE_RUN))
+        paragraphs[len(paragraphs) // 2].append(_text_run(' '.join(keywords[10:20]), WHITE_RUN))
+
+    return etree.tostring(root, xml_declaration=True, encoding='UTF-8', standalone=True)
+
+
+def patch_core_xml(xml_bytes, fields):
+    """Set keywords / description / subject on docProps/core.xml, creating it if needed"""
+    from lxml import etree
+    if xml_bytes:
+        root = etree.fromstring(xml_bytes)
+    else:
+        root = etree.Element(_qn(CP_NS, 'coreProperties'),
+                             nsmap={'cp': CP_NS, 'dc': DC_NS, 'dcterms': DCTERMS_NS, 'xsi': XSI_NS})
+    tags = {'keywords': _qn(CP_NS, 'keywords'), 'comments': _qn(DC_NS, 'description'),
+            'subject': _qn(DC_NS, 'subject')}
+    for field, value in fields.items():
+        element = root.find(tags[field])
+        if element is None:
+            element = etree.SubElement(root, tags[field])
+        element.text = value
+    return etree.tostring(root, xml_declaration=True, encoding='UTF-8', standalone=True)
+
+
+def patch_custom_xml(xml_bytes, properties):
+    """Set string custom properties on docProps/custom.xml, creating it if needed"""
+    from lxml import etree
+    if xml_bytes:
+        root = etree.fromstring(xml_bytes)
+    else:
+        root = etree.Element(_qn(CUSTOM_NS, 'Properties'), nsmap={None: CUSTOM_NS, 'vt': VT_NS})
+
+    existing = {prop.get('name'): prop for prop in root.findall(_qn(CUSTOM_NS, 'property'))}
+    next_pid = max([int(p.get('pid', 1)) for p in existing.values()] + [1]) + 1
+    for name, value in properties.items():
+        prop = existing.get(name)
+        if prop is None:
+            prop = etree.SubElement(root, _qn(CUSTOM_NS, 'property'),
+                                    fmtid=CUSTOM_PROPS_FMTID, pid=str(next_pid), name=name)
+            next_pid += 1
+        for child in list(prop):
+            prop.remove(child)
+        etree.SubElement(prop, _qn(VT_NS, 'lpwstr')).text = value
+    return etree.tostring(root, xml_declaration=True, encoding='UTF-8', standalone=True)
+
+
+def _ensure_relationship(rels_bytes, rel_type, target):
+    """Add a package relationship if none of that type exists; returns (bytes, changed)"""
+    from lxml import etree
+    root = etree.fromstring(rels_bytes)
+    for rel in root.findall(_qn(REL_NS, 'Relationship')):
+        if rel.get('Type') == rel_type:
+            return rels_bytes, False
+    ids = {rel.get('Id') for rel in root}
+    n = len(ids) + 1
+    while f'rId{n}' in ids:
+        n += 1
+    etree.SubElement(root, _qn(REL_NS, 'Relationship'), Id=f'rId{n}', Type=rel_type, Target=target)
+    return etree.tostring(root, xml_declaration=True, encoding='UTF-8', standalone=True), True
+
+
+def _ensure_override(types_bytes, part_name, content_type):
+    """Add a content-type override for a part if missing; returns (bytes, changed)"""
+    from lxml import etree
+    root = etree.fromstring(types_bytes)
+    for override in root.findall(_qn(CT_NS, 'Override')):
+        if override.get('PartName') == part_name:
+            return types_bytes, False
+    etree.SubElement(root, _qn(CT_NS, 'Override'), PartName=part_name, ContentType=content_type)
+    return etree.tostring(root, xml_declaration=True, encoding='UTF-8', standalone=True), True
+
+
+def _relationship_targets(rels_bytes):
+    from lxml import etree
+    root = etree.fromstring(rels_bytes)
+    return {rel.get('Type'): _part_name(rel.get('Target')) for rel in root.findall(_qn(REL_NS, 'Relationship'))}
+
+
+# --- Entry point -----------------------------------------------------------
+
+def _write_package(source, infos, rewritten, output_path, deterministic=False):
+    """Write infos (raw-copied from source) plus rewritten parts next to output_path
+
+    Returns the temporary path; the caller moves it over output_path with
+    os.replace once source is closed (Windows can't replace an open file).
+
+    In deterministic mode entries are written in a fixed order, [Content_Types].xml
+    first and then by name, all with the same timestamp, so identical content
+    always produces identical bytes.
+    """
+    entries = [(info.filename, info) for info in infos]
+    entries += [(name, None) for name in rewritten if name not in {info.filename for info in infos}]
+    if deterministic:
+        entries.sort(key=lambda entry: (entry[0] != '[Content_Types].xml', entry[0]))
+
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, 'wb') as out:
+        writer = RawZipWriter(out)
+        for name, info in entries:
+            date_time = DEFAULT_DATE_TIME if deterministic or info is None else info.date_time
+            if name in rewritten:
+                writer.write(name, rewritten[name], date_time)
+            elif deterministic:
+                writer.copy_raw(source, info, date_time)
+            else:
+                writer.copy_raw(source, info)
+        writer.close()
+    return tmp_path
+
+
+def normalize_docx(path):
+    """Rewrite a DOCX in place with a fixed entry order and timestamps"""
+    with open(path, 'rb') as source, zipfile.ZipFile(source) as package:
+        tmp_path = _write_package(source, package.infolist(), {}, path, deterministic=True)
+    os.replace(tmp_path, path)
+
+
+def patch_docx_keywords(docx_path, output_path, keywords, core_fields, custom_properties,
+                        deterministic=False):
+    """Write output_path as docx_path plus invisible keywords and metadata
+
+    Returns the number of parts rewritten; every other part is byte-copied.
+    """
+    with open(docx_path, 'rb') as source, zipfile.ZipFile(source) as package:
+        infos = package.infolist()
+        names = {info.filename for info in infos}
+
+        rels = package.read('_rels/.rels')
+        targets = _relationship_targets(rels)
+        document_part = targets.get(RT_OFFICE_DOCUMENT, 'word/document.xml')
+        core_part = targets.get(RT_CORE_PROPS, 'docProps/core.xml')
+        custom_part = targets.get(RT_CUSTOM_PROPS, 'docProps/custom.xml')
+
+        rewritten = {
+            document_part: patch_document_xml(package.read(document_part), keywords),
+            core_part: patch_core_xml(package.read(core_part) if core_part in names else None,
+                                      core_fields),
+        }
+        if custom_properties:
+            rewritten[custom_part] = patch_custom_xml(
+                package.read(custom_part) if custom_part in names else None, custom_properties)
+
+        # New parts need a package relationship and a content-type override
+        types = package.read('[Content_Types].xml')
+        rels_changed = types_changed = False
+        for part, rel_type, content_type in ((core_part, RT_CORE_PROPS, CT_CORE_PROPS),
+                                             (custom_part, RT_CUSTOM_PROPS, CT_CUSTOM_PROPS)):
+            if part in rewritten and part not in names:
+                rels, changed = _ensure_relationship(rels, rel_type, part)
+                rels_changed |= changed
+                types, changed = _ensure_override(types, '/' + part, content_type)
+                types_changed |= changed
+        if rels_changed:
+            rewritten['_rels/.rels'] = rels
+        if types_changed:
+            rewritten['[Content_Types].xml'] = types
+
+        tmp_path = _write_package(source, infos, rewritten, output_path, deterministic)
+    os.replace(tmp_path, output_path)
+
+    return len(rewritten)
@@ -0,0 +1,138 @@
+# jd_language.py
+"""
+Job description language routing
+Identifies the language of a job description from its most common function
+words before any model is loaded, maps it to a spaCy pipeline and a small
+phrase vocabulary, and keeps only the pipelines in use in an LRU cache.
+"""
+
+import re
+import threading
+from collections import Counter, OrderedDict
+
+DEFAULT_LANGUAGE = 'en'
+
+# Characters sampled for identification; function words saturate long before this
+LANGUAGE_SAMPLE_CHARS = 5000
+
+# Fewer stopword hits than this is too little evidence to leave the default
+MIN_STOPWORD_HITS = 3
+
+# Frequent function words that are rare in the other listed languages
+STOPWORDS = {
+    'en': {'the', 'and', 'of', 'to', 'with', 'for', 'is', 'are', 'you', 'our', 'we', 'will', 'be',
+           'on', 'an', 'this', 'that', 'or', 'your', 'have', 'from', 'as', 'in'},
+    'de': {'der', 'die', 'das', 'und', 'mit', 'für', 'ist', 'sind', 'sie', 'wir', 'ein', 'eine',
+           'einer', 'von', 'zu', 'im', 'auf', 'den', 'dem', 'des', 'auch', 'oder', 'bei', 'unser',
+           'unsere', 'ihre', 'werden'},
+    'fr': {'le', 'la', 'les', 'et', 'des', 'du', 'une', 'un', 'pour', 'avec', 'dans', 'est', 'sont',
+           'nous', 'vous', 'votre', 'vos', 'sur', 'au', 'aux', 'ou', 'qui', 'notre'},
+    'es': {'el', 'la', 'los', 'las', 'y', 'del', 'que', 'con', 'para', 'por', 'una', 'es', 'son',
+           'nuestro', 'nuestra', 'tu', 'se', 'al', 'como', 'sus'},
+    'it': {'il', 'lo', 'gli', 'le', 'e', 'di', 'della', 'che', 'con', 'per', 'una', 'nel', 'sono',
+           'è', 'nostro', 'nostra', 'si', 'al', 'come', 'dei'},
+    'nl': {'de', 'het', 'een', 'en', 'van', 'voor', 'met', 'op', 'zijn', 'wij', 'je', 'jij', 'ons',
+           'onze', 'naar', 'dat', 'die', 'bij', 'als', 'te'},
+    'pt': {'o', 'os', 'as', 'e', 'do', 'da', 'dos', 'das', 'que', 'com', 'para', 'por', 'uma', 'um',
+           'em', 'no', 'na', 'é', 'são', 'nosso', 'nossa', 'você', 'ao', 'como'},
+}
+
+# Multi-word skills in each language, matched alongside the English list
+# (most non-English postings still name technologies in English)
+LANGUAGE_PHRASES = {
+    'de': ['maschinelles lernen', 'künstliche intelligenz', 'verarbeitung natürlicher sprache',
+           'datenanalyse', 'große sprachmodelle', 'generative ki'],
+    'fr': ['apprentissage automatique', 'intelligence artificielle', 'apprentissage profond',
+           'science des données', 'traitement du langage naturel', 'ia générative'],
+    'es': ['aprendizaje automático', 'inteligencia artificial', 'aprendizaje profundo',
+           'ciencia de datos', 'procesamiento de lenguaje natural', 'ia generativa'],
+    'it': ['apprendimento automatico', 'intelligenza artificiale', 'apprendimento profondo',
+           'scienza dei dati', 'elaborazione del linguaggio naturale', 'ia generativa'],
+    'nl': ['machinaal leren', 'kunstmatige intelligentie', 'datawetenschap',
+           'natuurlijke taalverwerking', 'generatieve ai'],
+    'pt': ['aprendizado de máquina', 'inteligência artificial', 'aprendizado profundo',
+           'ciência de dados', 'processamento de linguagem natural', 'ia generativa'],
+}
+
+_WORD = re.compile(r"[^\W\d_]+")
+
+
+def detect_language(text, default=DEFAULT_LANGUAGE):
+    """Return the ISO 639-1 code of the language with most stopword hits
+
+    Falls back to default when the text has too few function words to tell.
+    """
+    hits = Counter()
+    for word in _WORD.findall(text[:LANGUAGE_SAMPLE_CHARS].lower()):
+        for language, stopwords in STOPWORDS.items():
+            if word in stopwords:
+                hits[language] += 1
+    if not hits:
+        return default
+    (best, count), = hits.most_common(1)
+    if count < MIN_STOPWORD_HITS or hits[default] == count:
+        return default
+    return best
+
+
+def parse_language_models(value):
+    """Parse "de:de_core_news_sm,fr:fr_core_news_sm" into a language -> model dict"""
+    models = {}
+    for item in value.split(','):
+        language, _, model = item.partition(':')
+        if language.strip() and model.strip():
+            models[language.strip().lower()] = model.strip()
+    return models
+
+
+def model_for_language(language, config):
+    """spaCy model configured for a language, or None if it has none"""
+    if language in (None, DEFAULT_LANGUAGE):
+        return config.spacy_model
+    return parse_language_models(config.language_models).get(language)
+
+
+def phrases_for_language(language, base_phrases):
+    """English key phrases plus the language's own, if it has any"""
+    return list(base_phrases) + LANGUAGE_PHRASES.get(language, [])
+
+
+class PipelineCache:
+    """Thread-safe LRU cache of loaded pipelines
+
+    At most max_models pipelines are kept; loading another evicts the least
+    recently used one. Models that failed to load are remembered, so a
+    missing model costs one failed load per process, not one per job.
+    """
+
+    def __init__(self, loader, max_models=2):
+        self.loader = loader
+        self.max_models = max_models
+        self.missing = set()
+        self.evictions = 0
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, name):
+        """Return the named pipeline, loading it on first use; OSError if it is not installed"""
+        with self._lock:
+            if name in self._models:
+                self._models.move_to_end(name)
+                return self._models[name]
+            if name in self.missing:
+                raise OSError(f"Model '{name}' is not installed")
+            try:
+                model = self.loader(name)
+            except OSError:
+                self.missing.add(name)
+                raise
+            self._models[name] = model
+            while len(self._models) > max(1, self.max_models):
+                self._models.popitem(last=False)
+                self.evictions += 1
+            return model
+
+    def loaded(self):
+        """Names of loaded pipelines, least recently used first"""
+        with self._lock:
+            return list(self._models)
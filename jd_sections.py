@@ -0,0 +1,187 @@
+# jd_sections.py
+"""
+Fast job description segmenter
+Splits a job description into sections so keywords can be weighted by where
+they appear and boilerplate can be skipped before the spaCy pass
+"""
+
+import re
+
+REQUIREMENTS = 'requirements'
+NICE_TO_HAVE = 'nice_to_have'
+RESPONSIBILITIES = 'responsibilities'
+ABOUT_US = 'about_us'
+BENEFITS = 'benefits'
+OTHER = 'other'
+
+# Multiplier applied to every keyword score found in a section.
+# Sections weighted 0 are boilerplate and never reach spaCy.
+SECTION_WEIGHTS = {
+    REQUIREMENTS: 1.5,
+    RESPONSIBILITIES: 1.0,
+    OTHER: 1.0,
+    NICE_TO_HAVE: 0.5,
+    ABOUT_US: 0.0,
+    BENEFITS: 0.0,
+}
+
+# Checked in order, so "preferred qualifications" is classed as nice-to-have
+# before the generic "qualifications" requirement heading can match it
+SECTION_HEADINGS = [
+    (NICE_TO_HAVE, r'nice[\s-]to[\s-]haves?|preferred|bonus|good[\s-]to[\s-]have|desired|'
+                   r'pluses|would be a plus|extra credit'),
+    (REQUIREMENTS, r'requirements?|qualifications?|must[\s-]haves?|what you(?:\'ll)? bring|'
+                   r'what we(?:\'re| are) looking for|who you are|skills|experience|'
+                   r'you (?:have|should have)|about you'),
+    (RESPONSIBILITIES, r'responsibilities|what you(?:\'ll| will)? do|the role|your role|duties|'
+                       r'day[\s-]to[\s-]day|in this role|your impact|what you\'ll work on|'
+                       r'about (?:the|this) (?:role|job|position|opportunity)'),
+    (BENEFITS, r'benefits|perks|what we offer|compensation|salary|why join|why work|'
+               r'equal opportunity(?: employer)?|eeo|diversity|our offer'),
+    (ABOUT_US, r'about (?:us|the company|the team)|who we are|our mission|company overview|'
+               r'our story|our company|our team'),
+]
+
+# "About <company name>" is boilerplate, but "About the role/job" (LinkedIn's
+# heading for the whole posting) is not; it is matched as responsibilities.
+# The name could be anything ("About Python"), so only marked lines qualify.
+_NAMED_ABOUT = re.compile(r'^about (?!(?:the|this) (?:role|job|position|opportunity)\b)'
+                          r'[a-z0-9&.\- ]{1,30}$', re.IGNORECASE)
+
+_ANY_HEADING = '|'.join(pattern for _, pattern in SECTION_HEADINGS)
+
+# A marked line ("Requirements:", "## Benefits") opens a section if it starts
+# with a heading phrase; a bare line only if it is nothing but heading phrases
+# ("Skills & Experience", "Preferred Qualifications"), so a body line such
+# as "Our team ships daily" never opens a section
+_HEADING_PATTERNS = [(section, re.compile(rf'^(?:{pattern})\b', re.IGNORECASE))
+                     for section, pattern in SECTION_HEADINGS]
+_BARE_HEADING_PATTERNS = [
+    (section, re.compile(rf'^(?:{pattern})(?:(?:\s*[&/,]\s*|\s+(?:and\s+)?)(?:{_ANY_HEADING}))*$',
+                         re.IGNORECASE))
+    for section, pattern in SECTION_HEADINGS
+]
+
+# Largest piece of text handed to spaCy at once; well below nlp.max_length,
+# so peak memory depends on this rather than on the size of the input
+MAX_CHUNK_CHARS = 50_000
+
+# Job description text sent to the LLM is capped at this many characters
+LLM_MAX_JD_CHARS = 12_000
+
+_LINE = re.compile(r'[^\n]*\n|[^\n]+')
+_SENTENCE_END = re.compile(r'(?<=[.!?;])\s+')
+
+# Headings are short lines, optionally wrapped in markdown/bullet noise
+_HEADING_NOISE = re.compile(r'^[\s#*\-•_=]+|[\s#*\-•_=:]+$')
+_BULLET = re.compile(r'^\s*(?:[-*•]|\d+[.)])\s')
+MAX_HEADING_LENGTH = 60
+MAX_HEADING_WORDS = 5
+
+
+def classify_heading(line):
+    """Return the section a heading line opens, or None if it is not a heading"""
+    stripped = _HEADING_NOISE.sub('', line)
+    if not stripped or len(stripped) > MAX_HEADING_LENGTH or stripped.endswith('.'):
+        return None
+    # Without a colon or markdown marker only short, non-bullet lines count as
+    # headings, so "- Experience with AWS" stays inside its section
+    marked = line.rstrip().endswith(':') or line.lstrip().startswith('#')
+    # "Salary: $150k" is a field, not a heading; only a bare line or one that
+    # ends in a colon can open a section
+    if ':' in stripped:
+        return None
+    if not marked and (_BULLET.match(line) or len(stripped.split()) > MAX_HEADING_WORDS):
+        return None
+    for section, pattern in (_HEADING_PATTERNS if marked else _BARE_HEADING_PATTERNS):
+        if pattern.match(stripped):
+            return section
+    if marked and _NAMED_ABOUT.match(stripped):
+        return ABOUT_US
+    return None
+
+
+def split_long_text(text, max_chars=MAX_CHUNK_CHARS):
+    """Yield pieces of at most max_chars, split on sentence, then word boundaries"""
+    piece = ''
+    for sentence in _SENTENCE_END.split(text):
+        if not sentence:
+            continue
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(' ', 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            if piece:
+                yield piece
+                piece = ''
+            yield sentence[:cut]
+            sentence = sentence[cut:].lstrip()
+        if piece and len(piece) + len(sentence) + 1 > max_chars:
+            yield piece
+            piece = ''
+        piece = f"{piece} {sentence}" if piece else sentence
+    if piece:
+        yield piece
+
+
+def iter_sections(jd_text, max_chars=None):
+    """Yield (section, text) pairs in document order, reading line by line
+
+    Text before the first recognised heading is reported as 'other'.
+    Heading lines open their section, so no text is ever dropped.
+    With max_chars set, long sections are yielded as several consecutive
+    chunks split on line or sentence boundaries, none longer than max_chars.
+    """
+    section = OTHER
+    lines = []
+    size = 0
+    for match in _LINE.finditer(jd_text):
+        line = match.group()
+        heading = classify_heading(line)
+        if heading is not None or (max_chars and size + len(line) > max_chars):
+            if any(l.strip() for l in lines):
+                yield section, ''.join(lines)
+            section = heading or section
+            lines = []
+            size = 0
+        if max_chars and len(line) > max_chars:
+            for piece in split_long_text(line, max_chars):
+                yield section, piece
+            continue
+        lines.append(line)
+        size += len(line)
+    if any(l.strip() for l in lines):
+        yield section, ''.join(lines)
+
+
+def iter_section_chunks(jd_text, max_chars=MAX_CHUNK_CHARS):
+    """Yield (section, chunk) pairs small enough for a single spaCy pass"""
+    return iter_sections(jd_text, max_chars)
+
+
+def condense_job_description(jd_text, max_chars=LLM_MAX_JD_CHARS):
+    """Return the non-boilerplate part of a job description, capped at max_chars"""
+    if len(jd_text) <= max_chars:
+        return jd_text
+    parts = []
+    size = 0
+    for section, chunk in iter_section_chunks(jd_text, max(max_chars // 4, 1)):
+        if is_boilerplate(section) or size + len(chunk) > max_chars:
+            continue
+        parts.append(chunk if chunk[-1:].isspace() else chunk + '\n')
+        size += len(parts[-1])
+    return ''.join(parts) or jd_text[:max_chars]
+
+
+def segment_job_description(jd_text):
+    """Split a job description into a list of (section, text) pairs"""
+    return list(iter_sections(jd_text))
+
+
+def section_weight(section):
+    """Return the keyword weight multiplier for a section"""
+    return SECTION_WEIGHTS.get(section, 1.0)
+
+
+def is_boilerplate(section):
+    """True for sections that are skipped before keyword extraction"""
+    return section_weight(section) <= 0
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3.10
+"""
+Cross-Batch Keyword Analytics
+Fold extracted keywords from every batch run into one market-wide report
+"""
+
+import os
+import json
+from collections import Counter
+from datetime import datetime
+from itertools import combinations
+
+ANALYTICS_FILE = "keyword_analytics.json"
+BATCH_DIR_PREFIX = "batch_optimized_"
+# Every keyword a job description asks for, whatever the strategy injected
+KEYWORDS_FILE = "jd_keywords.txt"
+# Older batches only have the injected keywords, which are the full JD list
+# only for the default strategy (the one that also writes keyword weights)
+LEGACY_KEYWORDS_FILE = "extracted_keywords.txt"
+LEGACY_MARKER_FILE = "keyword_weights.json"
+RESULTS_FILE = "batch_results.json"
+
+# Bump when what the aggregate counts changes; older aggregates are rebuilt
+AGGREGATE_VERSION = 2
+
+# Only the top-ranked keywords of each job feed the co-occurrence table,
+# which keeps it at most 105 pairs per job instead of 1225
+CO_OCCURRENCE_TOP = 15
+
+
+def empty_aggregate():
+    """Return a fresh, empty analytics aggregate"""
+    return {
+        'version': AGGREGATE_VERSION,
+        'total_jobs': 0,
+        'batches': {},
+        'frequency': {},
+        'co_occurrence': {},
+        'periods': {}
+    }
+
+
+def load_aggregate(filename=ANALYTICS_FILE):
+    """Load the analytics aggregate from disk, or a fresh one if it is from an older version"""
+    if os.path.exists(filename):
+        with open(filename, 'r', encoding='utf-8') as f:
+            aggregate = json.load(f)
+        if aggregate.get('version') == AGGREGATE_VERSION:
+            return aggregate
+    return empty_aggregate()
+
+
+def save_aggregate(aggregate, filename=ANALYTICS_FILE):
+    """Save the analytics aggregate to disk atomically"""
+    tmp_file = f"{filename}.tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(aggregate, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_file, filename)
+
+
+def batch_period(batch_dir):
+    """Return the YYYY-MM period a batch directory belongs to"""
+    stamp = os.path.basename(os.path.normpath(batch_dir))[len(BATCH_DIR_PREFIX):]
+    try:
+        return datetime.strptime(stamp, '%Y%m%d_%H%M%S').strftime('%Y-%m')
+    except ValueError:
+        return datetime.fromtimestamp(os.path.getmtime(batch_dir)).strftime('%Y-%m')
+
+
+def read_job_keywords(keywords_path):
+    """Read one job's keyword file as an ordered, de-duplicated list"""
+    with open(keywords_path, 'r', encoding='utf-8') as f:
+        keywords = [line.strip().lower() for line in f if line.strip()]
+    return list(dict.fromkeys(keywords))
+
+
+def add_job(aggregate, keywords, period):
+    """Fold a single job's keywords into the aggregate"""
+    frequency = aggregate['frequency']
+    for keyword in keywords:
+        frequency[keyword] = frequency.get(keyword, 0) + 1
+
+    co_occurrence = aggregate['co_occurrence']
+    for pair in combinations(sorted(keywords[:CO_OCCURRENCE_TOP]), 2):
+        key = ' | '.join(pair)
+        co_occurrence[key] = co_occurrence.get(key, 0) + 1
+
+    bucket = aggregate['periods'].setdefault(period, {'jobs': 0, 'keywords': {}})
+    bucket['jobs'] += 1
+    for keyword in keywords:
+        bucket['keywords'][keyword] = bucket['keywords'].get(keyword, 0) + 1
+
+    aggregate['total_jobs'] += 1
+
+
+def find_batch_dirs(root='.'):
+    """List batch output directories under root"""
+    return sorted(
+        os.path.join(root, name) for name in os.listdir(root)
+        if name.startswith(BATCH_DIR_PREFIX) and os.path.isdir(os.path.join(root, name))
+    )
+
+
+def job_keywords_path(job_dir):
+    """Path of a job's full JD keyword list, or None if it has none
+
+    Jobs of the LLM strategy only record the keywords missing from the
+    resume; counting those would undercount every skill the resume has.
+    """
+    path = os.path.join(job_dir, KEYWORDS_FILE)
+    if os.path.exists(path):
+        return path
+    legacy = os.path.join(job_dir, LEGACY_KEYWORDS_FILE)
+    if os.path.exists(legacy) and os.path.exists(os.path.join(job_dir, LEGACY_MARKER_FILE)):
+        return legacy
+    return None
+
+
+def update_aggregate(aggregate, batch_dirs):
+    """Fold jobs not yet seen into the aggregate and return how many were added
+
+    Completed batches (those with a results file) are skipped without being
+    listed, so the cost of an update grows with the number of new jobs rather
+    than with the whole history. Only demand-side keyword lists are counted.
+    """
+    added = 0
+    for batch_dir in batch_dirs:
+        name = os.path.basename(os.path.normpath(batch_dir))
+        state = aggregate['batches'].get(name)
+        if state and state['complete']:
+            continue
+
+        seen_jobs = set(state['jobs']) if state else set()
+        complete = os.path.exists(os.path.join(batch_dir, RESULTS_FILE))
+        period = batch_period(batch_dir)
+
+        for job_name in sorted(os.listdir(batch_dir)):
+            if job_name in seen_jobs or not os.path.isdir(os.path.join(batch_dir, job_name)):
+                continue
+            keywords_path = job_keywords_path(os.path.join(batch_dir, job_name))
+            if keywords_path is None:
+                continue
+            add_job(aggregate, read_job_keywords(keywords_path), period)
+            seen_jobs.add(job_name)
+            added += 1
+
+        aggregate['batches'][name] = {
+            'complete': complete,
+            'period': period,
+            # Completed batches never change again, so their job list is dropped
+            'jobs': [] if complete else sorted(seen_jobs)
+        }
+    return added
+
+
+def top_skills(aggregate, top_n=20):
+    """Return (keyword, job count, share of jobs) for the most requested skills"""
+    total = aggregate['total_jobs'] or 1
+    counts = Counter(aggregate['frequency']).most_common(top_n)
+    return [(keyword, count, count / total) for keyword, count in counts]
+
+
+def top_pairs(aggregate, top_n=10):
+    """Return the most frequent co-occurring keyword pairs"""
+    return Counter(aggregate['co_occurrence']).most_common(top_n)
+
+
+def skill_trends(aggregate, min_jobs=3, top_n=10):
+    """Compare each skill's share of jobs in the latest period with earlier periods
+
+    Returns (rising, falling) lists of (keyword, share change). Skills seen in
+    fewer than min_jobs jobs overall are ignored to keep the noise out.
+    """
+    periods = sorted(aggregate['periods'])
+    if len(periods) < 2:
+        return [], []
+
+    latest = aggregate['periods'][periods[-1]]
+    earlier_jobs = sum(aggregate['periods'][p]['jobs'] for p in periods[:-1])
+    earlier_counts = Counter()
+    for period in periods[:-1]:
+        earlier_counts.update(aggregate['periods'][period]['keywords'])
+
+    changes = []
+    for keyword, count in aggregate['frequency'].items():
+        if count < min_jobs:
+            continue
+        latest_share = latest['keywords'].get(keyword, 0) / (latest['jobs'] or 1)
+        earlier_share = earlier_counts.get(keyword, 0) / (earlier_jobs or 1)
+        changes.append((keyword, latest_share - earlier_share))
+
+    changes.sort(key=lambda x: (x[1], x[0]))
+    rising = [c for c in reversed(changes) if c[1] > 0][:top_n]
+    falling = [c for c in changes if c[1] < 0][:top_n]
+    return rising, falling
+
+
+def skills_to_add(aggregate, resume_text, top_n=15):
+    """Return the most requested skills that do not appear in the resume"""
+    resume_lower = resume_text.lower()
+    total = aggregate['total_jobs'] or 1
+    missing = [(keyword, count) for keyword, count in Counter(aggregate['frequency']).most_common()
+               if keyword not in resume_lower]
+    return [(keyword, count, count / total) for keyword, count in missing[:top_n]]
+
+
+def print_report(aggregate, resume_text=None, top_n=20):
+    """Print the market-wide skill report"""
+    print(f"\n📊 Market Skill Report ({aggregate['total_jobs']} jobs, "
+          f"{len(aggregate['batches'])} batches)")
+    print("=" * 40)
+
+    if not aggregate['total_jobs']:
+        print("   No jobs analysed yet - run the batch optimizer first")
+        return
+
+    print("\n🔝 Most requested skills:")
+    for keyword, count, share in top_skills(aggregate, top_n):
+        print(f"   • {keyword:<30} {count:>5} jobs ({share:.0%})")
+
+    pairs = top_pairs(aggregate)
+    if pairs:
+        print("\n🔗 Skills asked for together:")
+        for pair, count in pairs:
+            print(f"   • {pair:<45} {count:>5} jobs")
+
+    rising, falling = skill_trends(aggregate)
+    if rising or falling:
+        print(f"\n📈 Trend ({sorted(aggregate['periods'])[-1]} vs earlier):")
+        for keyword, change in rising:
+            print(f"   ▲ {keyword:<30} {change:+.0%}")
+        for keyword, change in falling:
+            print(f"   ▼ {keyword:<30} {change:+.0%}")
+
+    if resume_text:
+        missing = skills_to_add(aggregate, resume_text)
+        if missing:
+            print("\n💡 In-demand skills missing from your resume:")
+            for keyword, count, share in missing:
+                print(f"   • {keyword:<30} {count:>5} jobs ({share:.0%})")
+
+
+def run_analytics(root='.', resume_file=None, filename=ANALYTICS_FILE):
+    """Update the aggregate with new batch output and print the report"""
+    aggregate = load_aggregate(filename)
+    added = update_aggregate(aggregate, find_batch_dirs(root))
+    save_aggregate(aggregate, filename)
+    print(f"✅ Added {added} new jobs to {filename}")
+
+    resume_text = None
+    if resume_file:
+        from ats_optimizer import read_resume_text
+        resume_text = read_resume_text(resume_file)
+
+    print_report(aggregate, resume_text)
+    return aggregate
+
+
+def main():
+    """Main analytics function"""
+    try:
+        print("📊 Cross-Batch Keyword Analytics")
+        print("=" * 40)
+
+        resume_file = None
+        docx_files = [f for f in os.listdir('.') if f.endswith('.docx')]
+        if docx_files and input("\nCompare against a resume? (y/n): ").lower().startswith('y'):
+            for i, file in enumerate(docx_files, 1):
+                print(f"{i}. {file}")
+            try:
+                resume_file = docx_files[int(input("\nSelect resume file: ")) - 1]
+            except (ValueError, IndexError):
+                print("❌ Invalid selection, skipping resume comparison")
+
+        run_analytics(resume_file=resume_file)
+
+    except KeyboardInterrupt:
+        print("\n\n👋 Goodbye!")
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
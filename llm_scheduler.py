@@ -0,0 +1,332 @@
+# llm_scheduler.py
+"""
+Rate-limit-aware LLM scheduler
+Token buckets for requests per minute and tokens per minute, a priority queue
+so interactive requests jump ahead of batch work, and live queue metrics.
+One scheduler is shared by every LLM call in the process; with a quota file,
+the budgets and interactive priority are shared by every process too.
+"""
+
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 10
+
+# Rough size of a token in characters, used to budget prompts before sending
+CHARS_PER_TOKEN = 4
+
+
+class RateLimitError(Exception):
+    """Raised by a request function when the provider answers 429"""
+
+    def __init__(self, message="Rate limited by provider", retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at rate_per_minute
+
+    A rate of 0 or less disables the limit.
+    """
+
+    def __init__(self, rate_per_minute, capacity=None, clock=time.monotonic):
+        self.clock = clock
+        self.set_rate(rate_per_minute, capacity)
+        self.tokens = self.capacity
+        self.updated = clock()
+
+    def set_rate(self, rate_per_minute, capacity=None):
+        """Change the refill rate in place, keeping the tokens already earned"""
+        self.rate_per_minute = rate_per_minute
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(capacity if capacity is not None else rate_per_minute)
+        if hasattr(self, 'tokens'):
+            self.tokens = min(self.tokens, self.capacity)
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount):
+        """Seconds until amount tokens are available (0 if they are available now)"""
+        if self.rate <= 0:
+            return 0.0
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount):
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+    def drain(self):
+        """Empty the bucket, e.g. after the provider reports a rate limit"""
+        self._refill()
+        self.tokens = min(self.tokens, 0.0)
+
+
+class SharedQuota:
+    """Request and token budgets shared across processes through a locked file
+
+    The file holds both bucket levels with a wall-clock timestamp, any
+    Retry-After pause, and the interactive requests waiting in each process.
+    Batch requests hold back while another process has an interactive one
+    waiting, so the CLI is served first even while a batch is running.
+    """
+
+    # Seconds between checks while another process's interactive request waits
+    POLL_SECONDS = 0.25
+    # An interactive waiter that stops refreshing (its process died) expires
+    WAITER_TTL = 5.0
+
+    def __init__(self, path):
+        self.path = path
+        self.owner = f"{os.getpid()}:{id(self)}"
+
+    @contextmanager
+    def _locked(self):
+        """Yield the state dict under an exclusive lock and write it back"""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'a+', encoding='utf-8') as f:
+            f.seek(0)
+            if os.name == 'nt':
+                import msvcrt
+                while True:
+                    try:
+                        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        continue  # LK_LOCK gives up after 10 seconds; keep waiting
+            else:
+                import fcntl
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                try:
+                    state = json.loads(f.read() or '{}')
+                except ValueError:
+                    state = {}
+                yield state
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(state))
+                f.flush()
+            finally:
+                f.seek(0)
+                if os.name == 'nt':
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+                else:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    @staticmethod
+    def _load(bucket, state, key, now):
+        """Set a local bucket to the shared level, refilled for the time since it was saved"""
+        if key in state:
+            elapsed = max(0.0, now - state.get('time', now))
+            bucket.tokens = min(bucket.capacity, state[key] + elapsed * max(bucket.rate, 0.0))
+            bucket.updated = bucket.clock()
+
+    def take(self, request_bucket, token_bucket, tokens, interactive):
+        """Take one request and its tokens from the shared budget
+
+        Returns 0 when they were taken, else the seconds to wait before
+        trying again.
+        """
+        with self._locked() as state:
+            now = time.time()
+            self._load(request_bucket, state, 'requests', now)
+            self._load(token_bucket, state, 'tokens', now)
+            waiters = {owner: expires for owner, expires in state.get('interactive', {}).items()
+                       if expires > now and owner != self.owner}
+            wait = max(state.get('blocked_until', 0.0) - now,
+                       request_bucket.wait_time(1),
+                       token_bucket.wait_time(tokens))
+            if not interactive and waiters:
+                wait = max(wait, self.POLL_SECONDS)
+            if wait <= 0:
+                request_bucket.consume(1)
+                token_bucket.consume(tokens)
+            elif interactive:
+                waiters[self.owner] = now + wait + self.WAITER_TTL
+            state.update(requests=request_bucket.tokens, tokens=token_bucket.tokens,
+                         time=now, interactive=waiters)
+            return wait
+
+    def penalize(self, retry_after=None):
+        """Empty the shared budget after a 429, pausing every process for retry_after"""
+        with self._locked() as state:
+            now = time.time()
+            state['time'] = now
+            state['requests'] = min(state.get('requests', 0.0), 0.0)
+            state['tokens'] = min(state.get('tokens', 0.0), 0.0)
+            if retry_after:
+                state['blocked_until'] = max(state.get('blocked_until', 0.0), now + retry_after)
+
+
+def estimate_tokens(prompt, max_output_tokens=0):
+    """Upper-bound estimate of the tokens a request will use"""
+    return len(prompt) // CHARS_PER_TOKEN + max_output_tokens
+
+
+class LLMScheduler:
+    """Run request functions no faster than the provider's RPM and TPM limits
+
+    Callers block in run() until their request reaches the head of the
+    priority queue and both buckets allow it. A RateLimitError from the
+    request drains the buckets, pauses for Retry-After and requeues the
+    request, up to max_retries times. burst caps how many requests may go
+    out back to back (default: a full minute's worth). With a SharedQuota
+    the buckets and interactive priority also span other processes.
+    """
+
+    def __init__(self, requests_per_minute, tokens_per_minute, max_retries=3, burst=None,
+                 clock=time.monotonic, quota=None):
+        self.clock = clock
+        self.quota = quota
+        self.request_bucket = TokenBucket(requests_per_minute, burst, clock=clock)
+        self.token_bucket = TokenBucket(tokens_per_minute, clock=clock)
+        self.max_retries = max_retries
+        self.burst = burst
+        self._queue = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._blocked_until = 0.0
+        self._stats = {
+            'in_flight': 0,
+            'completed': 0,
+            'failed': 0,
+            'rate_limited': 0,
+            'retries': 0,
+            'tokens_sent': 0,
+            'wait_seconds': 0.0,
+        }
+
+    def set_limits(self, requests_per_minute, tokens_per_minute, max_retries=None):
+        """Update limits without losing queued requests or earned tokens"""
+        with self._condition:
+            self.request_bucket.set_rate(requests_per_minute, self.burst)
+            self.token_bucket.set_rate(tokens_per_minute)
+            if max_retries is not None:
+                self.max_retries = max_retries
+            self._condition.notify_all()
+
+    def _acquire(self, tokens, priority):
+        """Block until this request may be sent, then take its tokens"""
+        ticket = (priority, next(self._sequence))
+        queued_at = self.clock()
+        with self._condition:
+            heapq.heappush(self._queue, ticket)
+            # A new head may have arrived; let the current waiter re-check
+            self._condition.notify_all()
+            while True:
+                if self._queue[0] == ticket:
+                    wait = max(self._blocked_until - self.clock(),
+                               self.request_bucket.wait_time(1),
+                               self.token_bucket.wait_time(tokens))
+                    if wait <= 0 and self.quota is not None:
+                        wait = self.quota.take(self.request_bucket, self.token_bucket, tokens,
+                                               priority <= PRIORITY_INTERACTIVE)
+                    elif wait <= 0:
+                        self.request_bucket.consume(1)
+                        self.token_bucket.consume(tokens)
+                    if wait <= 0:
+                        break
+                    self._condition.wait(timeout=wait)
+                else:
+                    self._condition.wait()
+
+            heapq.heappop(self._queue)
+            self._stats['in_flight'] += 1
+            self._stats['tokens_sent'] += tokens
+            self._stats['wait_seconds'] += self.clock() - queued_at
+            self._condition.notify_all()
+
+    def _release(self, outcome, retry_after=None):
+        with self._condition:
+            self._stats['in_flight'] -= 1
+            if outcome == 'rate_limited':
+                self._stats['rate_limited'] += 1
+                self.request_bucket.drain()
+                self.token_bucket.drain()
+                if retry_after:
+                    self._blocked_until = max(self._blocked_until, self.clock() + retry_after)
+                if self.quota is not None:
+                    self.quota.penalize(retry_after)
+            else:
+                self._stats[outcome] += 1
+            self._condition.notify_all()
+
+    def run(self, request_fn, tokens, priority=PRIORITY_BATCH):
+        """Send request_fn() within the rate limits and return its result"""
+        for attempt in range(self.max_retries + 1):
+            self._acquire(tokens, priority)
+            try:
+                result = request_fn()
+            except RateLimitError as e:
+                retry_after = e.retry_after if e.retry_after is not None else 2 ** attempt
+                self._release('rate_limited', retry_after)
+                if attempt == self.max_retries:
+                    with self._condition:
+                        self._stats['failed'] += 1
+                    raise
+                with self._condition:
+                    self._stats['retries'] += 1
+                continue
+            except Exception:
+                self._release('failed')
+                raise
+            self._release('completed')
+            return result
+
+    def metrics(self):
+        """Snapshot of queue depth, throughput counters and bucket levels"""
+        with self._condition:
+            stats = dict(self._stats)
+            stats['queued'] = len(self._queue)
+            stats['queued_interactive'] = sum(1 for p, _ in self._queue if p <= PRIORITY_INTERACTIVE)
+            stats['queued_batch'] = stats['queued'] - stats['queued_interactive']
+            stats['requests_available'] = round(max(self.request_bucket.tokens, 0), 1)
+            stats['tokens_available'] = int(max(self.token_bucket.tokens, 0))
+            sent = stats['completed'] + stats['failed'] + stats['retries']
+            stats['avg_wait_seconds'] = round(stats['wait_seconds'] / sent, 2) if sent else 0.0
+            return stats
+
+
+def format_metrics(metrics):
+    """One-line summary of scheduler metrics for progress output"""
+    return (f"queue {metrics['queued']} (interactive {metrics['queued_interactive']}), "
+            f"in flight {metrics['in_flight']}, done {metrics['completed']}, "
+            f"429s {metrics['rate_limited']}, avg wait {metrics['avg_wait_seconds']}s, "
+            f"budget {metrics['requests_available']} req / {metrics['tokens_available']} tok")
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """Return the process-wide scheduler, applying the current config limits"""
+    global _scheduler
+    from ats_config import get_config
+    config = get_config()
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = LLMScheduler(config.llm_requests_per_minute, config.llm_tokens_per_minute,
+                                      config.llm_max_retries)
+        elif (_scheduler.request_bucket.rate_per_minute != config.llm_requests_per_minute or
+              _scheduler.token_bucket.rate_per_minute != config.llm_tokens_per_minute or
+              _scheduler.max_retries != config.llm_max_retries):
+            _scheduler.set_limits(config.llm_requests_per_minute, config.llm_tokens_per_minute,
+                                  config.llm_max_retries)
+        if (_scheduler.quota.path if _scheduler.quota else '') != config.llm_quota_file:
+            _scheduler.quota = SharedQuota(config.llm_quota_file) if config.llm_quota_file else None
+        return _scheduler
@@ -0,0 +1,590 @@
+#!/usr/bin/env python3.10
+"""
+Load-testing harness for the optimizer pipeline
+Replays synthetic or recorded job descriptions through process_batch or a
+single pipeline stage at one or more arrival rates, with LLM calls answered
+by a local stub server with configurable latency. Reports throughput, tail
+latency, CPU time and RSS per rate, and can fail on regressions against a
+saved baseline report.
+
+Examples:
+    python3.10 load_test.py --resume resume.docx --jobs 40 --rate 1,2,4
+    python3.10 load_test.py --resume resume.docx --entry llm --llm-latency lognormal:0.8,0.5
+    python3.10 load_test.py --resume resume.docx --source requests.jsonl --baseline load_report.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import multiprocessing
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from batch_progress import categorize_error, percentile
+
+ENTRY_POINTS = ('batch', 'extract', 'inject', 'llm')
+
+COMPANIES = ['Acme', 'Globex', 'Initech', 'Umbrella', 'Hooli', 'Stark Industries', 'Wayne Tech', 'Cyberdyne']
+POSITIONS = ['ML Engineer', 'Data Scientist', 'Backend Engineer', 'AI Engineer', 'Data Engineer', 'MLOps Engineer']
+SKILLS = [
+    'Python', 'Java', 'JavaScript', 'React', 'Node.js', 'AWS', 'Docker', 'Kubernetes', 'SQL', 'NoSQL',
+    'machine learning', 'deep learning', 'NLP', 'LLM', 'TensorFlow', 'PyTorch', 'scikit-learn', 'pandas',
+    'NumPy', 'FastAPI', 'LangChain', 'RAG', 'vector databases', 'embeddings', 'transformers', 'SageMaker',
+    'Hugging Face', 'Pinecone', 'FAISS', 'MLOps', 'prompt engineering', 'fine-tuning', 'LoRA', 'Spark',
+    'Kafka', 'Airflow', 'Terraform', 'CI/CD', 'data pipelines', 'generative AI',
+]
+DUTIES = [
+    'Design and ship {skill} services used by millions of customers.',
+    'Own the {skill} roadmap together with product and research.',
+    'Build evaluation tooling for {skill} models in production.',
+    'Mentor engineers and review designs involving {skill}.',
+    'Improve reliability and cost of our {skill} infrastructure.',
+]
+
+
+# --- Job sources ------------------------------------------------------------
+
+def synthetic_jobs(count, seed=0, sections=True):
+    """Generate job descriptions shaped like real postings (sections, boilerplate, skills)"""
+    rng = random.Random(seed)
+    jobs = []
+    for i in range(count):
+        skills = rng.sample(SKILLS, rng.randint(6, 14))
+        lines = []
+        if sections:
+            lines += ['About Us', f"{rng.choice(COMPANIES)} builds products for teams everywhere. "
+                                  "We value curiosity, ownership and kindness.", '']
+            lines.append('Responsibilities:')
+        lines += [f"- {rng.choice(DUTIES).format(skill=skill)}" for skill in skills[:4]]
+        if sections:
+            lines += ['', 'Requirements:']
+        lines += [f"- {rng.randint(2, 8)}+ years of experience with {skill}" for skill in skills[4:]]
+        if sections:
+            lines += ['', 'Benefits', '- Competitive salary, equity and remote-friendly culture']
+        jobs.append({
+            'company': f"{rng.choice(COMPANIES)} {i + 1}",
+            'position': rng.choice(POSITIONS),
+            'description': '\n'.join(lines),
+        })
+    return jobs
+
+
+def recorded_jobs(path, count=None):
+    """Read a JSON lines stream of job descriptions
+
+    Each line needs a 'description' (or 'body' / 'text'); 'company' and
+    'position' default to the record id and title when present.
+    """
+    jobs = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for n, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            description = record.get('description') or record.get('body') or record.get('text')
+            if not description:
+                continue
+            jobs.append({
+                'company': record.get('company') or record.get('request_id') or f"job {n}",
+                'position': record.get('position') or record.get('title') or 'Role',
+                'description': description,
+            })
+    if count:
+        # Cycle short recordings so every rate sees the requested number of jobs
+        jobs = [jobs[i % len(jobs)] for i in range(count)] if jobs else []
+    return jobs
+
+
+def arrival_times(count, rate, pattern='poisson', seed=0):
+    """Offsets in seconds at which each job arrives; rate <= 0 means all at once"""
+    if rate <= 0:
+        return [0.0] * count
+    if pattern == 'constant':
+        return [i / rate for i in range(count)]
+    rng = random.Random(seed)
+    offsets, now = [], 0.0
+    for _ in range(count):
+        offsets.append(now)
+        now += rng.expovariate(rate)
+    return offsets
+
+
+# --- LLM stub ---------------------------------------------------------------
+
+class LatencyModel:
+    """Sample request latencies from a spec string
+
+    fixed:S | uniform:LOW,HIGH | exponential:MEAN | lognormal:MEDIAN,SIGMA (seconds)
+    """
+
+    def __init__(self, spec, seed=0):
+        kind, _, params = spec.partition(':')
+        self.kind = kind
+        self.params = [float(p) for p in params.split(',') if p]
+        self.rng = random.Random(seed)
+        expected = {'fixed': 1, 'uniform': 2, 'exponential': 1, 'lognormal': 2}
+        if expected.get(kind) != len(self.params):
+            raise ValueError(f"Invalid latency spec '{spec}'")
+
+    def sample(self):
+        if self.kind == 'fixed':
+            return self.params[0]
+        if self.kind == 'uniform':
+            return self.rng.uniform(*self.params)
+        if self.kind == 'exponential':
+            return self.rng.expovariate(1 / self.params[0]) if self.params[0] > 0 else 0.0
+        median, sigma = self.params
+        return self.rng.lognormvariate(math.log(median), sigma) if median > 0 else 0.0
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    latency = None
+    error_rate = 0.0
+    rng = random.Random(0)
+    lock = threading.Lock()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        with self.lock:
+            delay = self.latency.sample()
+            rate_limited = self.rng.random() < self.error_rate
+            keywords = self.rng.sample(SKILLS, 10)
+        time.sleep(delay)
+
+        if rate_limited:
+            body = b'{"error": "rate limited"}'
+            self.send_response(429)
+            self.send_header('Retry-After', '1')
+        else:
+            body = json.dumps({'choices': [{'message': {'content': ', '.join(keywords)}}]}).encode('utf-8')
+            self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _serve_stub(port_queue, latency_spec, error_rate, seed):
+    _StubHandler.latency = LatencyModel(latency_spec, seed)
+    _StubHandler.error_rate = error_rate
+    _StubHandler.rng = random.Random(seed)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _StubHandler)
+    server.daemon_threads = True
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+@contextlib.contextmanager
+def llm_stub(latency_spec, error_rate=0.0, seed=0):
+    """Run an OpenAI-style chat completions stub in a child process and yield its URL
+
+    A separate process keeps the stub's CPU time out of the measurements.
+    """
+    LatencyModel(latency_spec)
+    port_queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_serve_stub, args=(port_queue, latency_spec, error_rate, seed),
+                                      daemon=True)
+    process.start()
+    try:
+        yield f"http://127.0.0.1:{port_queue.get(timeout=10)}/v1/chat/completions"
+    finally:
+        process.terminate()
+        process.join()
+
+
+# --- Resource sampling ------------------------------------------------------
+
+def current_rss():
+    """Resident set size in bytes, or None where /proc is unavailable"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def peak_rss():
+    """Peak resident set size of the process in bytes, or None if unknown"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class ResourceSampler:
+    """Track CPU time and RSS over a block, sampling RSS in the background"""
+
+    def __init__(self, interval=0.1):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, current_rss() or 0)
+
+    def __enter__(self):
+        self.start_rss = current_rss()
+        self.peak = self.start_rss or 0
+        self.cpu_start = time.process_time()
+        self.wall_start = time.perf_counter()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.cpu_seconds = time.process_time() - self.cpu_start
+        self.wall_seconds = time.perf_counter() - self.wall_start
+        end_rss = current_rss()
+        self.peak = max(self.peak, end_rss or 0) or peak_rss() or 0
+        self.end_rss = end_rss
+        return False
+
+
+# --- Running a stage --------------------------------------------------------
+
+def _mb(value):
+    return round(value / 2 ** 20, 1) if value else None
+
+
+def _distribution(values):
+    values = sorted(values)
+    return {
+        'p50': round(percentile(values, 50), 3),
+        'p95': round(percentile(values, 95), 3),
+        'p99': round(percentile(values, 99), 3),
+        'max': round(values[-1], 3) if values else 0.0,
+    }
+
+
+def _run_entry(entry, job, n, context):
+    """Run one job through a single pipeline stage; returns success"""
+    from ats_optimizer import (extract_missing_keywords_llm, extract_smart_keywords,
+                               extract_weighted_keywords, inject_invisible_keywords)
+    if entry == 'extract':
+        return bool(extract_weighted_keywords(job['description']))
+    if entry == 'llm':
+        return bool(extract_missing_keywords_llm(job['description'], context['resume_text'], debug_dir=None))
+    keywords = extract_smart_keywords(job['description'])
+    output = os.path.join(context['output_dir'], f"job_{n}", 'resume_ATS_Optimized.docx')
+    return inject_invisible_keywords(context['resume_file'], keywords, output)
+
+
+def run_jobs(entry, jobs, arrivals, context, concurrency):
+    """Open-loop replay: jobs are submitted at their arrival time whether or not earlier ones finished"""
+    lock = threading.Lock()
+    errors = Counter()
+    started = time.perf_counter()
+
+    def run_one(n, job, due):
+        begin = time.perf_counter()
+        try:
+            success = _run_entry(entry, job, n, context)
+            error = None
+        except Exception as e:
+            success, error = False, e
+        end = time.perf_counter()
+        if not success:
+            with lock:
+                errors[categorize_error(error)] += 1
+        return end - (started + due), end - begin, success
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = []
+        for n, (job, due) in enumerate(zip(jobs, arrivals), 1):
+            delay = started + due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            futures.append(pool.submit(run_one, n, job, due))
+        outcomes = [future.result() for future in futures]
+
+    return ([latency for latency, _, _ in outcomes], [service for _, service, _ in outcomes],
+            sum(1 for _, _, success in outcomes if success), errors)
+
+
+def batch_service_times(log_path):
+    """Job durations of the last batch in a progress log
+
+    The log is appended to, so a directory reused by a rerun (deterministic
+    mode) also holds earlier batches' events; only those after the last
+    batch_start belong to this one.
+    """
+    with open(log_path, 'r', encoding='utf-8') as f:
+        events = [json.loads(line) for line in f if line.strip()]
+    starts = [i for i, event in enumerate(events) if event['event'] == 'batch_start']
+    events = events[starts[-1]:] if starts else events
+    return [event['seconds'] for event in events if event['event'] == 'job_end']
+
+
+def run_batches(jobs, arrivals, context, batch_size, strategy, output_mode, workers):
+    """Replay jobs through process_batch, starting each batch when its last job has arrived"""
+    from batch_optimizer import process_batch
+    latencies, service, succeeded, errors = [], [], 0, Counter()
+    started = time.perf_counter()
+
+    for first in range(0, len(jobs), batch_size):
+        batch = jobs[first:first + batch_size]
+        due = arrivals[first:first + batch_size]
+        delay = started + due[-1] - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+        results = process_batch(batch, context['resume_file'], strategy, output_mode, workers)
+        if results is None:
+            # The batch was rejected before any job ran (e.g. no allow-list)
+            raise RuntimeError("process_batch rejected the batch; rerun with --verbose to see why")
+        finished = time.perf_counter()
+        latencies += [finished - (started + d) for d in due]
+
+        for result in results:
+            if result['success']:
+                succeeded += 1
+            else:
+                errors[result.get('error_category', 'write_failed')] += 1
+
+        # Per-job service time comes from the batch's own progress log
+        if results and results[0].get('output_dir'):
+            log = os.path.join(os.path.dirname(results[0]['output_dir']), 'progress.jsonl')
+            service += batch_service_times(log)
+
+    return latencies, service, succeeded, errors
+
+
+def run_stage(args, jobs, rate, context):
+    """Replay every job at one arrival rate and return the stage report"""
+    arrivals = arrival_times(len(jobs), rate, args.arrivals, args.seed)
+    output = io.StringIO() if not args.verbose else None
+    with ResourceSampler() as resources, \
+            (contextlib.redirect_stdout(output) if output is not None else contextlib.nullcontext()):
+        if args.entry == 'batch':
+            latencies, service, succeeded, errors = run_batches(
+                jobs, arrivals, context, args.batch_size, args.strategy, args.output_mode, args.workers)
+        else:
+            latencies, service, succeeded, errors = run_jobs(args.entry, jobs, arrivals, context,
+                                                             args.concurrency)
+
+    wall = max(resources.wall_seconds, 1e-9)
+    report = {
+        'entry': args.entry,
+        'rate': rate,
+        'jobs': len(jobs),
+        'succeeded': succeeded,
+        'failed': len(jobs) - succeeded,
+        'errors': dict(errors),
+        'wall_seconds': round(wall, 2),
+        'jobs_per_second': round(len(jobs) / wall, 3),
+        'jobs_per_hour': round(len(jobs) / wall * 3600),
+        'latency': _distribution(latencies),
+        'service': _distribution(service),
+        'cpu_seconds': round(resources.cpu_seconds, 2),
+        'cpu_per_job': round(resources.cpu_seconds / max(len(jobs), 1), 4),
+        'cpu_utilization': round(resources.cpu_seconds / wall, 2),
+        'rss_start_mb': _mb(resources.start_rss),
+        'rss_end_mb': _mb(resources.end_rss),
+        'rss_peak_mb': _mb(resources.peak),
+    }
+    if args.entry == 'llm' or args.strategy in ('llm-keyword-inject', 'hybrid'):
+        from llm_scheduler import get_scheduler
+        metrics = get_scheduler().metrics()
+        report['llm'] = {key: metrics[key] for key in ('completed', 'failed', 'rate_limited', 'retries',
+                                                       'avg_wait_seconds')}
+    return report
+
+
+# --- Reporting --------------------------------------------------------------
+
+def print_report(stages):
+    print(f"\n📊 Load Test Results")
+    print("=" * 40)
+    for stage in stages:
+        rate = f"{stage['rate']}/s" if stage['rate'] > 0 else 'max'
+        latency, service = stage['latency'], stage['service']
+        print(f"\n🚦 {stage['entry']} @ {rate}: {stage['succeeded']}/{stage['jobs']} succeeded "
+              f"in {stage['wall_seconds']}s")
+        print(f"   ⏱️  Throughput: {stage['jobs_per_second']:.2f} jobs/s ({stage['jobs_per_hour']} jobs/hour)")
+        print(f"   📈 Latency p50 {latency['p50']:.2f}s p95 {latency['p95']:.2f}s "
+              f"p99 {latency['p99']:.2f}s max {latency['max']:.2f}s")
+        print(f"   ⚙️  Service p50 {service['p50']:.2f}s p95 {service['p95']:.2f}s p99 {service['p99']:.2f}s")
+        print(f"   🧮 CPU {stage['cpu_seconds']}s ({stage['cpu_per_job']}s/job, "
+              f"{stage['cpu_utilization']} cores busy)")
+        print(f"   💾 RSS {stage['rss_start_mb']} → {stage['rss_end_mb']} MB (peak {stage['rss_peak_mb']} MB)")
+        if stage['errors']:
+            print(f"   ⚠ Errors: {', '.join(f'{k} {v}' for k, v in sorted(stage['errors'].items()))}")
+        if 'llm' in stage:
+            llm = stage['llm']
+            print(f"   🤖 LLM: {llm['completed']} ok, {llm['rate_limited']} 429s, "
+                  f"{llm['retries']} retries, avg wait {llm['avg_wait_seconds']}s")
+
+
+def find_regressions(stages, baseline, tolerance):
+    """Compare stages with a baseline report; returns human-readable regressions"""
+    previous = {(s['entry'], s['rate']): s for s in baseline.get('stages', [])}
+    regressions = []
+    for stage in stages:
+        base = previous.get((stage['entry'], stage['rate']))
+        if base is None:
+            continue
+        label = f"{stage['entry']} @ {stage['rate']}/s"
+        if stage['jobs_per_second'] < base['jobs_per_second'] * (1 - tolerance):
+            regressions.append(f"{label}: throughput {stage['jobs_per_second']} < {base['jobs_per_second']} jobs/s")
+        if stage['latency']['p95'] > base['latency']['p95'] * (1 + tolerance):
+            regressions.append(f"{label}: p95 {stage['latency']['p95']}s > {base['latency']['p95']}s")
+        if base.get('rss_peak_mb') and stage['rss_peak_mb'] and \
+                stage['rss_peak_mb'] > base['rss_peak_mb'] * (1 + tolerance):
+            regressions.append(f"{label}: peak RSS {stage['rss_peak_mb']} > {base['rss_peak_mb']} MB")
+    return regressions
+
+
+# --- Command line -----------------------------------------------------------
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Replay job descriptions through the optimizer at fixed rates and report "
+                    "throughput, tail latency, CPU and RSS.")
+    parser.add_argument('--resume', required=True, help="resume .docx used for every job")
+    parser.add_argument('--source', default='synthetic',
+                        help="'synthetic' or a JSON lines file of job descriptions (default: synthetic)")
+    parser.add_argument('--jobs', type=int, default=20, help="jobs replayed per rate (default: 20)")
+    parser.add_argument('--rate', default='0',
+                        help="comma-separated arrival rates in jobs/s; 0 = all at once (default: 0)")
+    parser.add_argument('--arrivals', choices=('poisson', 'constant'), default='poisson',
+                        help="arrival process (default: poisson)")
+    parser.add_argument('--entry', choices=ENTRY_POINTS, default='batch',
+                        help="pipeline entry point to drive (default: batch)")
+    parser.add_argument('--strategy', choices=('default', 'llm-keyword-inject', 'hybrid'), default='default',
+                        help="batch keyword strategy (default: default)")
+    parser.add_argument('--output-mode', choices=('invisible', 'visible-skills'), default='invisible',
+                        help="batch output mode (default: invisible)")
+    parser.add_argument('--allowlist', default='skills_allowlist.txt',
+                        help="skills allow-list for --output-mode visible-skills (default: skills_allowlist.txt)")
+    parser.add_argument('--batch-size', type=int, default=10, help="jobs per process_batch call (default: 10)")
+    parser.add_argument('--workers', type=int, default=None, help="process_batch workers (default: config)")
+    parser.add_argument('--concurrency', type=int, default=4,
+                        help="worker threads for non-batch entry points (default: 4)")
+    parser.add_argument('--llm-latency', default='lognormal:0.5,0.4',
+                        help="stub latency: fixed:S, uniform:LOW,HIGH, exponential:MEAN or "
+                             "lognormal:MEDIAN,SIGMA (default: lognormal:0.5,0.4)")
+    parser.add_argument('--llm-error-rate', type=float, default=0.0,
+                        help="fraction of stub responses that are 429s (default: 0)")
+    parser.add_argument('--keep-quotas', action='store_true',
+                        help="keep the configured LLM rate limits instead of disabling them")
+    parser.add_argument('--seed', type=int, default=0, help="seed for jobs, arrivals and the stub")
+    parser.add_argument('--report', default='load_report.json', help="where to write the JSON report")
+    parser.add_argument('--baseline', help="previous report; exit 1 if throughput, p95 or RSS regress")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="allowed relative regression against the baseline (default: 0.2)")
+    parser.add_argument('--workdir', help="directory for pipeline output (default: a temporary directory)")
+    parser.add_argument('--verbose', action='store_true', help="show the pipeline's own output")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    rates = [float(rate) for rate in args.rate.split(',')]
+    resume_file = os.path.abspath(args.resume)
+    report_path = os.path.abspath(args.report)
+    if args.source == 'synthetic':
+        jobs = synthetic_jobs(args.jobs, args.seed)
+    else:
+        jobs = recorded_jobs(args.source, args.jobs)
+    if not jobs:
+        print("❌ No job descriptions to replay!")
+        return 1
+    if args.entry == 'batch' and args.output_mode == 'visible-skills' and not os.path.exists(args.allowlist):
+        print(f"❌ {args.allowlist} not found - visible-skills batches need an allow-list (--allowlist)")
+        return 1
+
+    print("🔥 ATS Optimizer Load Test")
+    print("=" * 40)
+    print(f"   • {len(jobs)} jobs per rate from {args.source}, entry point '{args.entry}'")
+    print(f"   • Rates: {', '.join(f'{r}/s' if r > 0 else 'max' for r in rates)} ({args.arrivals} arrivals)")
+    print(f"   • LLM stub latency {args.llm_latency}, 429 rate {args.llm_error_rate}")
+
+    # Point the pipeline at the stub and keep its output out of the caller's directory
+    workdir = args.workdir or tempfile.mkdtemp(prefix='ats_load_')
+    os.makedirs(workdir, exist_ok=True)
+    if os.path.exists('ats_config.json'):
+        shutil.copy('ats_config.json', workdir)
+    if os.path.exists(args.allowlist):
+        from skills_section import SKILLS_ALLOWLIST_FILE
+        shutil.copy(args.allowlist, os.path.join(workdir, SKILLS_ALLOWLIST_FILE))
+    original_dir = os.getcwd()
+
+    with llm_stub(args.llm_latency, args.llm_error_rate, args.seed) as url:
+        os.environ['ATS_LLM_API_URL'] = url
+        os.environ.setdefault('HF_TOKEN', 'load-test')
+        os.environ.setdefault('ATS_PROGRESS_VIEW', 'none')
+        if not args.keep_quotas:
+            os.environ['ATS_LLM_REQUESTS_PER_MINUTE'] = '0'
+            os.environ['ATS_LLM_TOKENS_PER_MINUTE'] = '0'
+        os.chdir(workdir)
+        try:
+            from ats_config import reload_config
+            from ats_optimizer import read_resume_text
+            reload_config()
+            context = {'resume_file': resume_file, 'resume_text': read_resume_text(resume_file),
+                       'output_dir': os.path.join(workdir, 'outputs')}
+
+            # Warm up model loading so the first rate isn't charged for it
+            from ats_optimizer import get_nlp
+            with contextlib.redirect_stdout(io.StringIO()):
+                get_nlp()
+
+            stages = []
+            for rate in rates:
+                print(f"\n🚀 Replaying at {rate}/s..." if rate > 0 else "\n🚀 Replaying at maximum rate...")
+                stages.append(run_stage(args, jobs, rate, context))
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            return 1
+        finally:
+            os.chdir(original_dir)
+            if not args.workdir:
+                shutil.rmtree(workdir, ignore_errors=True)
+
+    print_report(stages)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'settings': {key: value for key, value in vars(args).items() if key not in ('baseline', 'report')},
+        'cpu_count': os.cpu_count(),
+        'stages': stages,
+    }
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n📁 Report saved to: {report_path}")
+
+    if baseline is not None:
+        regressions = find_regressions(stages, baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ Regressions against {args.baseline}:")
+            for regression in regressions:
+                print(f"   • {regression}")
+            return 1
+        print(f"\n✅ No regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
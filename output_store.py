@@ -0,0 +1,114 @@
+# output_store.py
+"""
+Content-addressed output store
+Job artifacts are stored once under the SHA-256 of their bytes, and each job
+gets a manifest keyed by a hash of everything that determines its output:
+resume bytes, job description, strategy, output mode and the settings that
+affect results. Re-running a job with the same inputs restores its files from
+the store instead of regenerating them.
+
+Layout:
+    <root>/objects/ab/abcdef...   artifact bytes
+    <root>/jobs/<key>.json        {"files": {name: digest}, "result": {...}}
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from dataclasses import asdict
+
+# Bump when the artifacts a job produces change shape, to invalidate old entries
+STORE_VERSION = 2
+
+# Settings that change how a run behaves but not what it writes
+RUNTIME_ONLY_FIELDS = {
+    'batch_workers', 'progress_view', 'output_store', 'llm_timeout',
+    'llm_requests_per_minute', 'llm_tokens_per_minute', 'llm_max_retries',
+    'max_loaded_models', 'analysis_cache_dir', 'llm_quota_file',
+}
+
+
+def file_digest(path):
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def job_key(resume_digest, jd_text, strategy, output_mode, config, extra=None):
+    """Hash of every input that determines a job's artifacts"""
+    settings = {name: value for name, value in asdict(config).items() if name not in RUNTIME_ONLY_FIELDS}
+    header = json.dumps({
+        'version': STORE_VERSION,
+        'resume': resume_digest,
+        'strategy': strategy,
+        'output_mode': output_mode,
+        'config': settings,
+        'extra': extra,
+    }, sort_keys=True, ensure_ascii=False)
+    digest = hashlib.sha256(header.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(jd_text.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _atomic_write(path, write):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+class OutputStore:
+    """Store and restore job artifacts by content hash"""
+
+    def __init__(self, root):
+        self.root = root
+
+    def _object_path(self, digest):
+        return os.path.join(self.root, 'objects', digest[:2], digest)
+
+    def _manifest_path(self, key):
+        return os.path.join(self.root, 'jobs', f"{key}.json")
+
+    def get(self, key):
+        """Return the manifest for key, or None if it is missing or incomplete"""
+        try:
+            with open(self._manifest_path(key), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not all(os.path.exists(self._object_path(d)) for d in manifest['files'].values()):
+            return None
+        return manifest
+
+    def put(self, key, job_dir, result):
+        """Store every file in job_dir under key, along with its result summary"""
+        files = {}
+        for name in sorted(os.listdir(job_dir)):
+            path = os.path.join(job_dir, name)
+            if not os.path.isfile(path):
+                continue
+            digest = file_digest(path)
+            object_path = self._object_path(digest)
+            if not os.path.exists(object_path):
+                _atomic_write(object_path, lambda tmp: shutil.copyfile(path, tmp))
+            files[name] = digest
+
+        manifest = {'key': key, 'files': files, 'result': result}
+
+        def write_manifest(tmp):
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=2, sort_keys=True, ensure_ascii=False)
+        _atomic_write(self._manifest_path(key), write_manifest)
+        return manifest
+
+    def restore(self, manifest, job_dir):
+        """Copy a manifest's files into job_dir"""
+        os.makedirs(job_dir, exist_ok=True)
+        for name, digest in manifest['files'].items():
+            shutil.copyfile(self._object_path(digest), os.path.join(job_dir, name))
+        return sorted(manifest['files'])
@@ -0,0 +1,193 @@
+# resume_analysis.py
+"""
+Cached resume analysis
+The resume is tokenized once per distinct text: tokens, lemmas, noun chunks
+and the word n-gram set used for keyword matching are held in an immutable
+object keyed by a hash of the text and the spaCy model. Analyses are kept in
+memory for every job of a run and persisted to disk, so other processes and
+later runs load them instead of re-parsing the resume.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import cached_property
+
+from ats_config import get_config
+from semantic_matcher import resume_terms
+
+# Bump when the analysis format or content changes, to ignore old cache files
+ANALYSIS_VERSION = 1
+
+# Analyses kept in memory; a run rarely uses more than one resume
+MAX_CACHED_ANALYSES = 8
+
+_TOKEN = re.compile(r"[^\W_]+(?:[+#.'-][^\W_]+)*[+#]*")
+
+
+@dataclass(frozen=True)
+class ResumeAnalysis:
+    """Immutable token-level view of one resume text"""
+    digest: str
+    model: str
+    text_lower: str
+    tokens: tuple
+    lemmas: tuple
+    noun_chunks: tuple
+    ngrams: frozenset
+
+    @cached_property
+    def lemma_set(self):
+        return frozenset(self.lemmas)
+
+    def contains(self, keyword):
+        """Does the keyword appear verbatim (case insensitive) or as a word lemma"""
+        keyword = keyword.lower()
+        return keyword in self.text_lower or keyword in self.lemma_set
+
+
+def text_digest(resume_text):
+    return hashlib.sha256(resume_text.encode('utf-8')).hexdigest()
+
+
+def analyze_resume(resume_text, nlp=None, model='none', digest=None):
+    """Build the analysis with nlp, or with a plain tokenizer when nlp is None"""
+    text_lower = resume_text.lower()
+    if nlp is None:
+        tokens = tuple(_TOKEN.findall(text_lower))
+        lemmas, noun_chunks = tokens, ()
+    else:
+        doc = nlp(text_lower)
+        words = [token for token in doc if not token.is_space and not token.is_punct]
+        tokens = tuple(token.text for token in words)
+        lemmas = tuple((token.lemma_ or token.text).lower() for token in words)
+        try:
+            noun_chunks = tuple(dict.fromkeys(chunk.text for chunk in doc.noun_chunks))
+        except ValueError:
+            # Pipelines without a parser have no noun chunks
+            noun_chunks = ()
+    return ResumeAnalysis(
+        digest=digest or text_digest(resume_text),
+        model=model,
+        text_lower=text_lower,
+        tokens=tokens,
+        lemmas=lemmas,
+        noun_chunks=noun_chunks,
+        ngrams=frozenset(resume_terms(resume_text)),
+    )
+
+
+def _cache_path(cache_dir, digest, model):
+    safe_model = re.sub(r'[^\w.-]', '_', model)
+    return os.path.join(cache_dir, f"resume_{digest}_{safe_model}.json")
+
+
+def load_analysis(path, resume_text):
+    """Read a persisted analysis, or None if it is missing, stale or unreadable"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get('version') != ANALYSIS_VERSION:
+        return None
+    return ResumeAnalysis(
+        digest=data['digest'],
+        model=data['model'],
+        text_lower=resume_text.lower(),
+        tokens=tuple(data['tokens']),
+        lemmas=tuple(data['lemmas']),
+        noun_chunks=tuple(data['noun_chunks']),
+        ngrams=frozenset(data['ngrams']),
+    )
+
+
+def save_analysis(path, analysis):
+    """Persist an analysis atomically, so concurrent processes never read half a file"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    data = {
+        'version': ANALYSIS_VERSION,
+        'digest': analysis.digest,
+        'model': analysis.model,
+        'tokens': list(analysis.tokens),
+        'lemmas': list(analysis.lemmas),
+        'noun_chunks': list(analysis.noun_chunks),
+        'ngrams': sorted(analysis.ngrams),
+    }
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+_analyses = OrderedDict()
+_lock = threading.Lock()
+
+
+def _lookup(key, resume_text, path):
+    """Return a cached analysis from memory, then disk (remembering a disk hit), or None"""
+    if key in _analyses:
+        _analyses.move_to_end(key)
+        return _analyses[key]
+    analysis = load_analysis(path, resume_text) if path else None
+    if analysis is not None:
+        _remember(key, analysis)
+    return analysis
+
+
+def _remember(key, analysis):
+    _analyses[key] = analysis
+    if len(_analyses) > MAX_CACHED_ANALYSES:
+        _analyses.popitem(last=False)
+
+
+def get_resume_analysis(resume_text, use_nlp=True):
+    """Return the analysis for a resume text: from memory, then disk, else computed once
+
+    With use_nlp the spaCy pipeline routed to the resume's language is used,
+    but it is only loaded when neither cache has the analysis; without
+    use_nlp, or without an installed model, a plain tokenizer is used. Set
+    analysis_cache_dir to '' to keep analyses in memory only.
+    """
+    from jd_language import detect_language, model_for_language
+
+    config = get_config()
+    digest = text_digest(resume_text)
+    language = None
+    model = 'none'
+    if use_nlp:
+        language = detect_language(resume_text) if config.language_detection else None
+        model = model_for_language(language, config) or 'none'
+
+    def cache_path(model):
+        return _cache_path(config.analysis_cache_dir, digest, model) if config.analysis_cache_dir else None
+
+    with _lock:
+        analysis = _lookup((digest, model), resume_text, cache_path(model))
+        if analysis is not None:
+            return analysis
+
+        nlp = None
+        if model != 'none':
+            from ats_optimizer import get_nlp
+            nlp = get_nlp(language, required=False)
+            if nlp is None:
+                # The model is not installed; use (or build) the tokenizer-only analysis
+                model = 'none'
+                analysis = _lookup((digest, model), resume_text, cache_path(model))
+                if analysis is not None:
+                    return analysis
+
+        analysis = analyze_resume(resume_text, nlp, model, digest)
+        path = cache_path(model)
+        if path:
+            try:
+                save_analysis(path, analysis)
+            except OSError as e:
+                print(f"⚠ Could not cache resume analysis: {e}")
+        _remember((digest, model), analysis)
+        return analysis
@@ -0,0 +1,185 @@
+# semantic_matcher.py
+"""
+Semantic keyword matching
+Resolves synonyms and spelling variants ("k8s" vs "kubernetes", "LLMs" vs
+"large language models") so they are not reported as missing keywords.
+
+Terms are first normalised through an alias table, then compared with
+L2-normalised character n-gram vectors held in a small in-memory index.
+Queries are batched into one matrix product, so a job's keywords resolve
+against a whole resume in milliseconds on CPU.
+"""
+
+import hashlib
+import re
+import zlib
+from collections import OrderedDict
+
+# Alias -> canonical skill name. Words with a common non-skill meaning
+# ("node", "cv", "ts") are left out, so "worker nodes" never reads as Node.js.
+SKILL_ALIASES = {
+    'k8s': 'kubernetes',
+    'kube': 'kubernetes',
+    'llm': 'large language models',
+    'llms': 'large language models',
+    'large language model': 'large language models',
+    'ml': 'machine learning',
+    'ai': 'artificial intelligence',
+    'genai': 'generative ai',
+    'gen ai': 'generative ai',
+    'nlp': 'natural language processing',
+    'dl': 'deep learning',
+    'rag': 'retrieval augmented generation',
+    'retrieval-augmented generation': 'retrieval augmented generation',
+    'js': 'javascript',
+    'nodejs': 'node.js',
+    'node js': 'node.js',
+    'reactjs': 'react',
+    'react.js': 'react',
+    'py': 'python',
+    'python3': 'python',
+    'tf': 'tensorflow',
+    'sklearn': 'scikit-learn',
+    'scikit learn': 'scikit-learn',
+    'hf': 'hugging face',
+    'huggingface': 'hugging face',
+    'aws': 'amazon web services',
+    'gcp': 'google cloud platform',
+    'google cloud': 'google cloud platform',
+    'azure cloud': 'azure',
+    'postgres': 'postgresql',
+    'mongo': 'mongodb',
+    'ci/cd': 'continuous integration',
+    'cicd': 'continuous integration',
+    'vector db': 'vector databases',
+    'vector dbs': 'vector databases',
+    'vector database': 'vector databases',
+    'fine tuning': 'fine-tuning',
+    'finetuning': 'fine-tuning',
+}
+
+# Canonical names are never singularised ("kubernetes", "node.js")
+CANONICAL_TERMS = frozenset(SKILL_ALIASES.values())
+
+# Single words that end in "s" without being plurals
+NON_PLURALS = {'kubernetes', 'redis', 'pandas', 'keras', 'jenkins', 'windows', 'ios', 'macos', 'sas'}
+NON_PLURAL_ENDINGS = ('ss', 'sis', 'us', 'ics', 'ops')
+
+NGRAM_SIZE = 3
+EMBEDDING_DIM = 512
+
+# Cosine similarity above which two terms are treated as the same skill
+DEFAULT_THRESHOLD = 0.85
+
+# Resume indexes kept in memory, keyed by a hash of the resume text
+MAX_CACHED_INDEXES = 4
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9+#./-]*")
+_TRAILING_PUNCT = re.compile(r"[.,;:!?)\]]+$")
+
+
+def normalize_term(term):
+    """Lowercase, tidy and alias-resolve a term to its canonical form"""
+    term = ' '.join(_TRAILING_PUNCT.sub('', word) for word in term.lower().split())
+    if term in SKILL_ALIASES:
+        return SKILL_ALIASES[term]
+    # Plural forms of single words ("apis", "pipelines") match their singular.
+    # Aliases apply to the raw term only: the singular is never looked up, so
+    # "nodes" stays "node" instead of becoming an unrelated skill.
+    if (term.isalpha() and len(term) > 3 and term.endswith('s') and term not in CANONICAL_TERMS and
+            term not in NON_PLURALS and not term.endswith(NON_PLURAL_ENDINGS)):
+        return term[:-1]
+    return term
+
+
+def _ngrams(term):
+    padded = f" {term} "
+    return [padded[i:i + NGRAM_SIZE] for i in range(len(padded) - NGRAM_SIZE + 1)]
+
+
+def embed_terms(terms):
+    """Embed terms as L2-normalised hashed character n-gram vectors (one row per term)
+
+    crc32 is used instead of hash() so vectors are stable across processes.
+    """
+    import numpy as np
+    matrix = np.zeros((len(terms), EMBEDDING_DIM), dtype=np.float32)
+    for row, term in enumerate(terms):
+        for gram in _ngrams(term):
+            matrix[row, zlib.crc32(gram.encode('utf-8')) % EMBEDDING_DIM] += 1.0
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class SkillIndex:
+    """Exact-match set plus a dense vector index over canonical skill terms"""
+
+    def __init__(self, terms):
+        self.terms = sorted({normalize_term(t) for t in terms if t.strip()})
+        self.term_set = set(self.terms)
+        try:
+            self.vectors = embed_terms(self.terms) if self.terms else None
+        except ImportError:
+            # Without numpy only alias-normalised exact matches are available
+            self.vectors = None
+
+    def nearest(self, queries):
+        """Return (best term, similarity) for each query, batched in one product"""
+        canonical = [normalize_term(q) for q in queries]
+        results = [None] * len(queries)
+        pending = []
+        for i, term in enumerate(canonical):
+            if term in self.term_set:
+                results[i] = (term, 1.0)
+            else:
+                pending.append(i)
+
+        if pending and self.vectors is not None:
+            scores = embed_terms([canonical[i] for i in pending]) @ self.vectors.T
+            best = scores.argmax(axis=1)
+            for row, i in enumerate(pending):
+                results[i] = (self.terms[best[row]], float(scores[row, best[row]]))
+
+        return [r if r is not None else (None, 0.0) for r in results]
+
+    def contains(self, queries, threshold=DEFAULT_THRESHOLD):
+        """Return a list of booleans: does each query match a term in the index"""
+        return [score >= threshold for _, score in self.nearest(queries)]
+
+
+def resume_terms(resume_text, max_words=3):
+    """All 1 to max_words word n-grams of the resume, the vocabulary it is indexed on"""
+    words = _WORD.findall(resume_text.lower())
+    terms = set()
+    for n in range(1, max_words + 1):
+        for i in range(len(words) - n + 1):
+            terms.add(' '.join(words[i:i + n]))
+    return terms
+
+
+_resume_indexes = OrderedDict()
+
+
+def get_resume_index(resume_text, terms=None):
+    """Return the SkillIndex for a resume, building it once per distinct text
+
+    terms may pass an already computed resume_terms() set.
+    """
+    key = hashlib.sha1(resume_text.encode('utf-8')).hexdigest()
+    if key in _resume_indexes:
+        _resume_indexes.move_to_end(key)
+        return _resume_indexes[key]
+    index = SkillIndex(terms if terms is not None else resume_terms(resume_text))
+    _resume_indexes[key] = index
+    if len(_resume_indexes) > MAX_CACHED_INDEXES:
+        _resume_indexes.popitem(last=False)
+    return index
+
+
+def semantic_missing(keywords, resume_text, threshold=DEFAULT_THRESHOLD, terms=None):
+    """Return keywords with no exact, alias or near-duplicate match in the resume"""
+    if not keywords:
+        return []
+    present = get_resume_index(resume_text, terms).contains(keywords, threshold)
+    return [kw for kw, found in zip(keywords, present) if not found]
@@ -0,0 +1,204 @@
+# skills_section.py
+"""
+Visible, tailored "Relevant Skills" section
+Writes only the job keywords the candidate actually has, styled like the
+resume's existing skills section, so recruiters and ATS see the same content
+"""
+
+import copy
+import os
+from ats_config import get_config
+from semantic_matcher import normalize_term
+
+SKILLS_ALLOWLIST_FILE = "skills_allowlist.txt"
+SECTION_TITLE = "Relevant Skills"
+MAX_HEADING_WORDS = 5
+
+
+def load_skill_allowlist(filename=SKILLS_ALLOWLIST_FILE):
+    """Load the candidate's confirmed skills, one per line, keyed by canonical name"""
+    if not os.path.exists(filename):
+        return {}
+    allowlist = {}
+    with open(filename, 'r', encoding='utf-8') as f:
+        for line in f:
+            skill = line.strip()
+            if skill and not skill.startswith('#'):
+                allowlist.setdefault(normalize_term(skill), skill)
+    return allowlist
+
+
+def match_allowed_skills(keywords, allowlist):
+    """Return allow-listed skills found among the keywords, in keyword rank order
+
+    Keywords are alias-normalised, so "k8s" in a JD selects "Kubernetes".
+    """
+    skills = []
+    for keyword in keywords:
+        skill = allowlist.get(normalize_term(keyword))
+        if skill and skill not in skills:
+            skills.append(skill)
+    return skills
+
+
+def review_skills(skills):
+    """Let the candidate drop any matched skill before it is written"""
+    if not skills:
+        return skills
+    print("\n🧾 Skills to add to the visible section:")
+    for i, skill in enumerate(skills, 1):
+        print(f"   {i}. {skill}")
+    answer = input("Numbers to remove (comma-separated, Enter to keep all): ").strip()
+    if not answer:
+        return skills
+    drop = {int(n) - 1 for n in answer.split(',') if n.strip().isdigit()}
+    return [skill for i, skill in enumerate(skills) if i not in drop]
+
+
+def _font_size(paragraph):
+    runs = [run for run in paragraph.runs if run.text.strip()]
+    return (runs[0].font.size if runs else None) or paragraph.style.font.size
+
+
+def _is_bold(paragraph):
+    runs = [run for run in paragraph.runs if run.text.strip()]
+    return bool(runs) and all(run.bold or (run.bold is None and paragraph.style.font.bold) for run in runs)
+
+
+def _looks_like_heading(paragraph, body_size=None):
+    """True if a paragraph is a short line set apart as a heading
+
+    It needs a heading style, bold text or a font larger than the body text,
+    and must not read like list content ("AWS, GCP") or a sentence.
+    """
+    text = paragraph.text.strip()
+    if not text or len(text.split()) > MAX_HEADING_WORDS or text[-1] in '.;' or ',' in text:
+        return False
+    size = _font_size(paragraph)
+    return (paragraph.style.name.startswith(('Heading', 'Title')) or _is_bold(paragraph) or
+            bool(size and body_size and size > body_size))
+
+
+def _heading_format(paragraph):
+    return paragraph.style.name, _is_bold(paragraph), _font_size(paragraph), paragraph.text.strip().isupper()
+
+
+def _is_heading_like(paragraph, template, body_size=None):
+    """True if a paragraph is a heading formatted like the template"""
+    return _looks_like_heading(paragraph, body_size) and _heading_format(paragraph) == _heading_format(template)
+
+
+def find_section_templates(doc):
+    """Find (heading, body, insert_after) paragraphs to style and place the new section
+
+    Prefers the resume's existing skills section, whose heading must be
+    formatted as one; otherwise the first heading style paragraph and the
+    first normal paragraph are used, and the section goes at the end of the
+    document.
+    """
+    paragraphs = doc.paragraphs
+    body_size = doc.styles['Normal'].font.size
+    for i, paragraph in enumerate(paragraphs):
+        if 'skill' not in paragraph.text.lower() or not _looks_like_heading(paragraph, body_size):
+            continue
+        body = next((p for p in paragraphs[i + 1:] if p.text.strip()), paragraph)
+        insert_after = paragraph
+        for following in paragraphs[i + 1:]:
+            if _is_heading_like(following, paragraph, body_size):
+                break
+            insert_after = following
+        return paragraph, body, insert_after
+
+    heading = next((p for p in paragraphs if p.style.name.startswith('Heading')), None)
+    body = next((p for p in paragraphs if p.text.strip() and p is not heading), None)
+    last = paragraphs[-1] if paragraphs else None
+    return heading or body, body or heading, last
+
+
+def _styled_paragraph(template, text):
+    """Create a paragraph element carrying the template's paragraph and run formatting"""
+    from docx.oxml import OxmlElement
+    from docx.oxml.ns import qn
+    p = OxmlElement('w:p')
+    r = OxmlElement('w:r')
+    if template is not None:
+        if template._p.pPr is not None:
+            p.append(copy.deepcopy(template._p.pPr))
+        runs = [run for run in template.runs if run.text.strip()]
+        if runs and runs[0]._r.rPr is not None:
+            r.append(copy.deepcopy(runs[0]._r.rPr))
+    t = OxmlElement('w:t')
+    t.text = text
+    t.set(qn('xml:space'), 'preserve')
+    r.append(t)
+    p.append(r)
+    return p
+
+
+def add_visible_skills_section(doc, skills, title=SECTION_TITLE):
+    """Insert a visible skills section and return the inserted elements"""
+    heading, body, insert_after = find_section_templates(doc)
+    if heading is not None and heading.text.strip().isupper():
+        title = title.upper()
+    elements = [_styled_paragraph(heading, title), _styled_paragraph(body, ', '.join(skills))]
+
+    if insert_after is None:
+        for element in elements:
+            doc.element.body.append(element)
+        return elements
+
+    anchor = insert_after._p
+    for element in elements:
+        anchor.addnext(element)
+        anchor = element
+    return elements
+
+
+def remove_elements(elements):
+    """Remove previously inserted elements, restoring the parsed document"""
+    for element in elements:
+        parent = element.getparent()
+        if parent is not None:
+            parent.remove(element)
+
+
+def save_with_skills_section(doc, skills, output_path, pdf_output_path=None):
+    """Add the section to an already parsed resume, save it, then undo the change
+
+    The document is left exactly as it was parsed, so one parse of the resume
+    can serve every job in a batch.
+    """
+    elements = add_visible_skills_section(doc, skills)
+    try:
+        os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+        doc.save(output_path)
+    finally:
+        remove_elements(elements)
+    if get_config().deterministic:
+        from docx_patch import normalize_docx
+        normalize_docx(output_path)
+
+    if pdf_output_path:
+        try:
+            from docx2pdf import convert
+            convert(output_path, pdf_output_path)
+        except Exception as e:
+            print(f"⚠ PDF conversion failed: {e}")
+
+
+def write_skills_section(docx_path, skills, output_path, pdf_output_path=None):
+    """Write a copy of the resume with a visible, tailored skills section"""
+    try:
+        if not skills:
+            print("⚠ No allow-listed skills matched this job - nothing to add")
+            return False
+
+        import docx
+        doc = docx.Document(docx_path)
+        save_with_skills_section(doc, skills, output_path, pdf_output_path)
+        print(f"✓ '{SECTION_TITLE}' section with {len(skills)} skills saved: '{output_path}'")
+        return True
+
+    except Exception as e:
+        print(f"❌ Error writing skills section: {e}")
+        return False
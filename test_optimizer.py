@@ -4,6 +4,10 @@ Test script for ATS optimizer functionality
 """
 
 import os
+import re
+import subprocess
+import sys
+import tempfile
 from ats_optimizer import extract_smart_keywords, analyze_job_description
 
 def test_keyword_extraction():
@@ -43,6 +47,581 @@ def test_file_operations():
         print(f"⚠️  No DOCX resume files found")
         return False
 
+def test_keyword_analytics():
+    """Test incremental cross-batch keyword aggregation"""
+    from keyword_analytics import empty_aggregate, update_aggregate, top_skills, skill_trends
+    print(f"\n📊 Testing Keyword Analytics")
+    print("=" * 30)
+
+    with tempfile.TemporaryDirectory() as root:
+        def write_job(batch, job, keywords, filename='jd_keywords.txt'):
+            job_dir = os.path.join(root, batch, job)
+            os.makedirs(job_dir, exist_ok=True)
+            with open(os.path.join(job_dir, filename), 'w', encoding='utf-8') as f:
+                f.write('\n'.join(keywords))
+
+        write_job('batch_optimized_20250101_100000', 'Acme_ML', ['python', 'aws', 'docker'])
+        write_job('batch_optimized_20250101_100000', 'Beta_AI', ['Python', 'pytorch'])
+        open(os.path.join(root, 'batch_optimized_20250101_100000', 'batch_results.json'), 'w').close()
+        write_job('batch_optimized_20250201_100000', 'Gamma_Data', ['python', 'llm'])
+        # LLM jobs record only what the resume lacks; that is not market demand
+        write_job('batch_optimized_20250201_100000', 'Omega_LLM', ['rust'], 'extracted_keywords.txt')
+        # Default-strategy jobs from before jd_keywords.txt still count
+        write_job('batch_optimized_20250101_100000', 'Zeta_Old', ['python', 'sql'], 'extracted_keywords.txt')
+        write_job('batch_optimized_20250101_100000', 'Zeta_Old', [], 'keyword_weights.json')
+
+        aggregate = empty_aggregate()
+        batch_dirs = lambda: sorted(os.path.join(root, d) for d in os.listdir(root))
+        assert update_aggregate(aggregate, batch_dirs()) == 4
+        assert 'rust' not in aggregate['frequency']
+
+        # Only jobs added since the last update are folded in
+        write_job('batch_optimized_20250201_100000', 'Delta_LLM', ['llm', 'python'])
+        assert update_aggregate(aggregate, batch_dirs()) == 1
+        assert update_aggregate(aggregate, batch_dirs()) == 0
+
+        assert top_skills(aggregate, 1) == [('python', 5, 1.0)]
+        assert aggregate['co_occurrence']['llm | python'] == 2
+        rising, _ = skill_trends(aggregate, min_jobs=2)
+        assert rising[0][0] == 'llm'
+
+    print(f"✅ Aggregated {aggregate['total_jobs']} jobs incrementally")
+    return True
+
+def test_section_segmentation():
+    """Test job description section splitting and weights"""
+    from jd_sections import segment_job_description, is_boilerplate
+    print(f"\n🧩 Testing Section Segmentation")
+    print("=" * 30)
+
+    jd = ("We are hiring an ML engineer.\n"
+          "About Us\nWe love ping pong.\n"
+          "Requirements:\n- Python and AWS\n- Experience with Docker\n"
+          "Preferred Qualifications:\n- Kubernetes\n"
+          "## Benefits\n- Free lunch\n")
+    sections = segment_job_description(jd)
+
+    assert [s for s, _ in sections] == ['other', 'about_us', 'requirements', 'nice_to_have', 'benefits']
+    assert ''.join(text for _, text in sections) == jd
+    assert [s for s, _ in sections if is_boilerplate(s)] == ['about_us', 'benefits']
+
+    # Role headings are the posting itself, and "Label: value" lines are not headings
+    for heading in ("About the role", "About the job", "About this role", "About the position",
+                    "About the opportunity"):
+        role = segment_job_description(f"{heading}\nKubernetes, Python, AWS and Docker.\nRequirements:\n- SQL\n")
+        assert [s for s, _ in role] == ['responsibilities', 'requirements'], heading
+    assert [s for s, _ in segment_job_description("About Acme Corp:\nWe sell rockets.\n")] == ['about_us']
+    # A bare line opens a section only if all of it is a heading phrase
+    body = ("Requirements\nBuild ML pipelines\nOur team ships daily\nCompensation data pipelines\n"
+            "About Python\nWork with Python and AWS\nSkills & Experience\n- Docker\n")
+    assert [s for s, _ in segment_job_description(body)] == ['requirements', 'requirements']
+    fields = segment_job_description("Location: Remote\nSalary: $150k-$180k\n"
+                                     "We are looking for an engineer with Python and PyTorch.\n")
+    assert [s for s, _ in fields] == ['other']
+
+    print(f"✅ Split into {len(sections)} sections")
+    return True
+
+def test_chunked_sections():
+    """Test that oversized job descriptions are split into bounded chunks"""
+    from jd_sections import iter_section_chunks
+    print(f"\n✂️  Testing Chunked Sections")
+    print("=" * 30)
+
+    sentence = "We need Python and AWS engineers. "
+    jd = "Requirements:\n" + (sentence * 500 + "\n") * 4 + "Benefits\nFree lunch\n"
+    chunks = list(iter_section_chunks(jd, max_chars=1000))
+
+    assert all(len(chunk) <= 1000 for _, chunk in chunks)
+    assert sum(chunk.count("Python") for _, chunk in chunks) == 2000
+    assert [s for s, _ in chunks][-1] == 'benefits'
+    assert {s for s, _ in chunks[:-1]} == {'requirements'}
+
+    print(f"✅ {len(jd)} characters split into {len(chunks)} chunks")
+    return True
+
+def test_config_reload():
+    """Test config file loading, environment overrides and hot reload"""
+    import json
+    from ats_config import get_config
+    print(f"\n⚙️  Testing Config Reload")
+    print("=" * 30)
+
+    with tempfile.TemporaryDirectory() as root:
+        config_file = os.path.join(root, 'ats_config.json')
+        assert get_config(config_file).max_keywords == 50
+
+        with open(config_file, 'w') as f:
+            json.dump({'max_keywords': 10, 'tech_weight': '4.5'}, f)
+        config = get_config(config_file)
+        assert (config.max_keywords, config.tech_weight) == (10, 4.5)
+
+        os.environ['ATS_MAX_KEYWORDS'] = '7'
+        try:
+            with open(config_file, 'w') as f:
+                json.dump({'max_keywords': 12}, f)
+            assert get_config(config_file).max_keywords == 7
+        finally:
+            del os.environ['ATS_MAX_KEYWORDS']
+
+    print(f"✅ Config reloaded from file and environment")
+    return True
+
+def test_llm_scheduler():
+    """Test token-bucket scheduling against a stub provider that enforces its limits"""
+    import threading
+    import time
+    from llm_scheduler import LLMScheduler, RateLimitError, TokenBucket, PRIORITY_BATCH, PRIORITY_INTERACTIVE
+    print(f"\n🚦 Testing LLM Scheduler")
+    print("=" * 30)
+
+    # Stub provider: 1200 requests per minute, at most 2 back to back
+    provider = TokenBucket(1200, capacity=2)
+    provider_lock = threading.Lock()
+    order = []
+
+    def stub_request(name):
+        def send():
+            with provider_lock:
+                if provider.wait_time(1) > 0:
+                    raise RateLimitError(retry_after=0.05)
+                provider.consume(1)
+                order.append(name)
+            return name
+        return send
+
+    scheduler = LLMScheduler(1200, 100000, burst=2)
+    start = time.monotonic()
+    results = [scheduler.run(stub_request(f"job{i}"), tokens=100) for i in range(8)]
+    elapsed = time.monotonic() - start
+
+    metrics = scheduler.metrics()
+    assert results == [f"job{i}" for i in range(8)]
+    assert metrics['rate_limited'] == 0 and metrics['completed'] == 8
+    assert elapsed >= 0.25  # 6 requests beyond the burst at 20 per second
+
+    # An interactive request overtakes batch requests already waiting
+    order.clear()
+    scheduler = LLMScheduler(1200, 100000, burst=1)
+    scheduler.run(stub_request("warmup"), tokens=1)
+    threads = [threading.Thread(target=scheduler.run, args=(stub_request(f"batch{i}"), 1, PRIORITY_BATCH))
+               for i in range(3)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.01)
+    interactive = threading.Thread(target=scheduler.run, args=(stub_request("interactive"), 1, PRIORITY_INTERACTIVE))
+    interactive.start()
+    for thread in threads + [interactive]:
+        thread.join()
+    assert order.index("interactive") <= 2
+
+    # Two processes (here: two schedulers) sharing a quota file share one budget,
+    # and an interactive request in one goes ahead of a batch request in the other
+    from llm_scheduler import SharedQuota
+    with tempfile.TemporaryDirectory() as root:
+        quota_file = os.path.join(root, 'quota.json')
+        cli = LLMScheduler(600, 100000, burst=1, quota=SharedQuota(quota_file))
+        batch = LLMScheduler(600, 100000, burst=1, quota=SharedQuota(quota_file))
+        batch.run(lambda: None, 1)
+        shared_start = time.monotonic()
+        cli.run(lambda: None, 1)
+        assert time.monotonic() - shared_start >= 0.05  # the batch used the only request
+
+        cli_quota, batch_quota = SharedQuota(quota_file), SharedQuota(quota_file)
+        cli_buckets = TokenBucket(600, capacity=1), TokenBucket(100000)
+        batch_buckets = TokenBucket(600, capacity=1), TokenBucket(100000)
+        time.sleep(0.11)
+        assert batch_quota.take(*batch_buckets, 1, interactive=False) == 0
+        assert cli_quota.take(*cli_buckets, 1, interactive=True) > 0  # now waiting
+        time.sleep(0.11)
+        assert batch_quota.take(*batch_buckets, 1, interactive=False) > 0  # holds back
+        assert cli_quota.take(*cli_buckets, 1, interactive=True) == 0
+        time.sleep(0.11)
+        assert batch_quota.take(*batch_buckets, 1, interactive=False) == 0
+
+    print(f"✅ 8 requests in {elapsed:.2f}s with no 429s; interactive served at position {order.index('interactive')}")
+    return True
+
+def test_hybrid_escalation():
+    """Test local confidence scoring and LLM budget planning"""
+    from ats_optimizer import local_extraction_confidence, plan_llm_escalations
+    print(f"\n🔀 Testing Hybrid Escalation")
+    print("=" * 30)
+
+    tech_heavy = [{'keyword': kw, 'score': 3, 'section': 'requirements', 'source': 'tech'}
+                  for kw in ['python', 'aws', 'docker', 'sql', 'rag', 'llm', 'pandas', 'numpy']]
+    generic = [{'keyword': kw, 'score': 1, 'section': 'other', 'source': 'noun'}
+               for kw in ['bakery', 'pastry', 'croissant', 'oven']]
+    assert local_extraction_confidence(tech_heavy) == 1.0
+    assert local_extraction_confidence(generic) == 0.0
+    assert local_extraction_confidence([]) == 0.0
+
+    confidences = {'a': 0.9, 'b': 0.1, 'c': 0.3, 'd': 0.45}
+    assert plan_llm_escalations(confidences, threshold=0.5, budget=2) == {'b', 'c'}
+    assert plan_llm_escalations(confidences, threshold=0.5, budget=0) == set()
+
+    print(f"✅ Least confident jobs escalated within budget")
+    return True
+
+def test_semantic_matching():
+    """Test that synonyms and spelling variants are not reported as missing"""
+    from semantic_matcher import semantic_missing, normalize_term
+    print(f"\n🧠 Testing Semantic Matching")
+    print("=" * 30)
+
+    resume = ("Deployed Kubernetes clusters on Amazon Web Services. Fine tuning of "
+              "large language models with PyTorch. Built data pipelines and REST APIs.")
+    keywords = ['k8s', 'LLMs', 'AWS', 'fine-tuning', 'pipeline', 'api', 'terraform', 'javascript']
+
+    assert normalize_term('K8s') == normalize_term('kubernetes') == 'kubernetes'
+    assert normalize_term('APIs') == 'api' and normalize_term('Pipelines') == 'pipeline'
+    for name in ('kubernetes', 'node.js', 'redis', 'pandas', 'devops', 'analytics'):
+        assert normalize_term(name) == name, name
+    assert normalize_term('Node JS') == normalize_term('NodeJS') == 'node.js'
+    # Short words with a non-skill meaning are not aliases
+    assert normalize_term('nodes') == 'node' and normalize_term('CV') == 'cv'
+    assert semantic_missing(['Node.js'], "Scaled Kubernetes worker nodes on AWS.") == ['Node.js']
+    assert semantic_missing(['computer vision'], "Attached CV and portfolio.") == ['computer vision']
+    assert semantic_missing(keywords, resume) == ['terraform', 'javascript']
+
+    print(f"✅ {len(keywords) - 2} of {len(keywords)} keywords matched by synonym or variant")
+    return True
+
+def test_progress_reporter():
+    """Test batch telemetry: throughput, ETA, percentiles, error categories and JSON lines"""
+    import io
+    import json
+    from batch_progress import ProgressReporter
+    print(f"\n📈 Testing Progress Reporter")
+    print("=" * 30)
+
+    now = [0.0]
+    with tempfile.TemporaryDirectory() as root:
+        jsonl_path = os.path.join(root, 'progress.jsonl')
+        progress = ProgressReporter(4, view='plain', jsonl_path=jsonl_path,
+                                    stream=io.StringIO(), clock=lambda: now[0])
+        for job in (1, 2, 3):
+            started = progress.job_started(job)
+            with progress.stage(job, 'extract'):
+                now[0] += job
+            error = ConnectionError("router down") if job == 3 else None
+            progress.job_finished(job, started, error is None, error)
+
+        snapshot = progress.close()
+        with open(jsonl_path, encoding='utf-8') as f:
+            events = [json.loads(line)['event'] for line in f]
+
+    assert snapshot['done'] == 3 and snapshot['failed'] == 1
+    assert snapshot['jobs_per_second'] == 0.5 and snapshot['eta_seconds'] == 2.0
+    assert snapshot['latency']['p50'] == 2.0 and snapshot['latency']['p99'] == 3.0
+    assert snapshot['stages']['extract']['done'] == 3
+    assert snapshot['errors'] == {'network': 1}
+    assert events[0] == 'batch_start' and events[-1] == 'batch_end' and events.count('job_end') == 3
+
+    # The tty panel is redrawn in place and other output scrolls above it
+    import contextlib
+    screen = io.StringIO()
+    with contextlib.redirect_stdout(screen):
+        progress = ProgressReporter(2, view='tty', clock=lambda: now[0])
+        for job in (1, 2):
+            started = progress.job_started(job)
+            print(f"job {job} output")
+            progress.job_finished(job, started, True)
+        progress.close()
+        assert sys.stdout is screen
+    output = screen.getvalue()
+    assert output.count('\033[1F\033[J') == 2  # one-line panel erased before job 2's output and panel
+    assert output.index('job 2 output') < output.rindex('Progress')
+    assert '2/2 done' in output.splitlines()[-1]
+
+    print(f"✅ {snapshot['jobs_per_second']} jobs/s, ETA {snapshot['eta_seconds']}s, errors {snapshot['errors']}")
+    return True
+
+def test_docx_patch():
+    """Test in-place DOCX patching: untouched parts are byte-copied, keywords land in XML"""
+    import zipfile
+    import docx
+    from docx_patch import patch_docx_keywords
+    print(f"\n🩹 Testing DOCX Patch Writer")
+    print("=" * 30)
+
+    keywords = [f"skill{i}" for i in range(25)]
+    with tempfile.TemporaryDirectory() as root:
+        source, output = os.path.join(root, 'resume.docx'), os.path.join(root, 'out', 'resume.docx')
+        doc = docx.Document()
+        for i in range(6):
+            doc.add_paragraph(f"Experience line {i}")
+        doc.save(source)
+
+        rewritten = patch_docx_keywords(source, output, keywords, {'keywords': 'skill0, skill1'},
+                                        {'ats_keywords': 'skill0'})
+        with zipfile.ZipFile(source) as before, zipfile.ZipFile(output) as after:
+            assert after.testzip() is None
+            unchanged = [n for n in before.namelist() if n not in
+                         ('word/document.xml', 'docProps/core.xml', '[Content_Types].xml', '_rels/.rels')]
+            assert all(before.read(n) == after.read(n) for n in unchanged)
+            assert b'ats_keywords' in after.read('docProps/custom.xml')
+            assert b'/docProps/custom.xml' in after.read('[Content_Types].xml')
+
+        patched = docx.Document(output)
+        texts = [p.text for p in patched.paragraphs]
+        assert texts[-1] == ' '.join(keywords)
+        assert texts[1].endswith('skill9') and 'skill10' in texts[len(texts) // 2]
+        assert patched.core_properties.keywords == 'skill0, skill1'
+
+    print(f"✅ {rewritten} parts rewritten, {len(unchanged)} copied byte for byte")
+    return True
+
+def test_output_store():
+    """Test deterministic DOCX bytes and the content-addressed output store"""
+    import time
+    import docx
+    from ats_config import ATSConfig
+    from docx_patch import normalize_docx
+    from output_store import OutputStore, job_key
+    print(f"\n♻️  Testing Output Store")
+    print("=" * 30)
+
+    config = ATSConfig()
+    key = job_key('resume-digest', 'Python and SQL', 'default', 'invisible', config)
+    assert key == job_key('resume-digest', 'Python and SQL', 'default', 'invisible', config)
+    assert key != job_key('resume-digest', 'Python and SQL', 'hybrid', 'invisible', config)
+    assert key == job_key('resume-digest', 'Python and SQL', 'default', 'invisible',
+                          ATSConfig(batch_workers=8))
+
+    with tempfile.TemporaryDirectory() as root:
+        copies = []
+        for name in ('a.docx', 'b.docx'):
+            doc = docx.Document()
+            doc.add_paragraph("Experience")
+            doc.save(os.path.join(root, name))
+            normalize_docx(os.path.join(root, name))
+            with open(os.path.join(root, name), 'rb') as f:
+                copies.append(f.read())
+            time.sleep(1.1)
+        assert copies[0] == copies[1]
+
+        job_dir = os.path.join(root, 'job')
+        os.makedirs(job_dir)
+        with open(os.path.join(job_dir, 'extracted_keywords.txt'), 'w', encoding='utf-8') as f:
+            f.write('python\nsql')
+        store = OutputStore(os.path.join(root, 'store'))
+        assert store.get(key) is None
+        store.put(key, job_dir, {'success': True, 'keywords_count': 2})
+        manifest = store.get(key)
+        restored = store.restore(manifest, os.path.join(root, 'rerun'))
+        with open(os.path.join(root, 'rerun', 'extracted_keywords.txt'), encoding='utf-8') as f:
+            assert f.read() == 'python\nsql'
+
+    assert restored == ['extracted_keywords.txt'] and manifest['result']['keywords_count'] == 2
+    print(f"✅ Stable DOCX bytes; job {key[:12]} restored from the store")
+    return True
+
+def test_language_routing():
+    """Test stopword language ID and the LRU pipeline cache"""
+    from jd_language import PipelineCache, detect_language, parse_language_models
+    print(f"\n🌍 Testing Language Routing")
+    print("=" * 30)
+
+    assert detect_language("Wir suchen eine Person für unser Team, die mit Python und AWS arbeitet.") == 'de'
+    assert detect_language("Vous rejoindrez notre équipe et travaillerez avec des outils de données.") == 'fr'
+    assert detect_language("You will join our team and work with the data platform.") == 'en'
+    assert detect_language("Python, AWS, Docker") == 'en'
+    assert parse_language_models("de:de_core_news_sm, fr:fr_core_news_sm") == {
+        'de': 'de_core_news_sm', 'fr': 'fr_core_news_sm'}
+
+    loads = []
+
+    def loader(name):
+        loads.append(name)
+        if name == 'missing':
+            raise OSError(name)
+        return name.upper()
+
+    cache = PipelineCache(loader, max_models=2)
+    assert cache.get('en') == 'EN' and cache.get('de') == 'DE'
+    cache.get('en')
+    cache.get('fr')
+    assert cache.loaded() == ['en', 'fr'] and cache.evictions == 1
+    for _ in range(2):
+        try:
+            cache.get('missing')
+        except OSError:
+            pass
+    assert loads == ['en', 'de', 'fr', 'missing']
+
+    print(f"✅ Languages detected; cache holds {cache.loaded()} after {cache.evictions} eviction")
+    return True
+
+def test_load_harness():
+    """Test the load generator: job streams, arrivals, LLM stub and regression check"""
+    import json
+    import urllib.request
+    from load_test import LatencyModel, arrival_times, batch_service_times, find_regressions, llm_stub, synthetic_jobs
+    print(f"\n🔥 Testing Load Harness")
+    print("=" * 30)
+
+    jobs = synthetic_jobs(5, seed=1)
+    assert jobs == synthetic_jobs(5, seed=1) and 'Requirements:' in jobs[0]['description']
+    assert arrival_times(3, 2, 'constant') == [0.0, 0.5, 1.0]
+    assert arrival_times(3, 0) == [0.0, 0.0, 0.0]
+    assert 0.1 <= LatencyModel('uniform:0.1,0.2').sample() <= 0.2
+
+    # A reused batch directory appends to progress.jsonl; only the last batch counts
+    with tempfile.TemporaryDirectory() as tmp:
+        log = os.path.join(tmp, 'progress.jsonl')
+        with open(log, 'w', encoding='utf-8') as f:
+            for seconds in ([1.0, 2.0], [3.0]):
+                f.write(json.dumps({'event': 'batch_start'}) + '\n')
+                f.writelines(json.dumps({'event': 'job_end', 'seconds': s}) + '\n' for s in seconds)
+        assert batch_service_times(log) == [3.0]
+
+    with llm_stub('fixed:0') as url:
+        request = urllib.request.Request(url, data=b'{}', headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request, timeout=10) as response:
+            content = json.load(response)['choices'][0]['message']['content']
+    assert len(content.split(',')) == 10
+
+    stage = {'entry': 'batch', 'rate': 1.0, 'jobs_per_second': 5.0, 'latency': {'p95': 1.0}, 'rss_peak_mb': 100}
+    slower = dict(stage, jobs_per_second=3.0)
+    assert find_regressions([stage], {'stages': [stage]}, 0.2) == []
+    assert len(find_regressions([slower], {'stages': [stage]}, 0.2)) == 1
+
+    print(f"✅ Stub answered with {len(content.split(','))} keywords; regressions detected")
+    return True
+
+def test_resume_analysis():
+    """Test the immutable resume analysis and its on-disk cache"""
+    import dataclasses
+    from resume_analysis import analyze_resume, load_analysis, save_analysis
+    print(f"\n🧠 Testing Resume Analysis")
+    print("=" * 30)
+
+    resume_text = "Built RAG pipelines in Python.\nDeployed services on AWS and Kubernetes."
+    analysis = analyze_resume(resume_text)
+    assert analysis.tokens[:4] == ('built', 'rag', 'pipelines', 'in')
+    assert 'rag pipelines' in analysis.ngrams and 'deployed services on' in analysis.ngrams
+    assert analysis.contains('Python') and analysis.contains('kubernetes') and not analysis.contains('Terraform')
+    try:
+        analysis.tokens = ()
+        assert False, "analysis should be immutable"
+    except dataclasses.FrozenInstanceError:
+        pass
+
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, 'cache', 'resume.json')
+        save_analysis(path, analysis)
+        loaded = load_analysis(path, resume_text)
+        assert loaded == analysis
+        assert load_analysis(os.path.join(root, 'missing.json'), resume_text) is None
+
+        # get_resume_analysis: computed once, then served from memory, then from disk
+        import resume_analysis
+        from ats_config import reload_config
+        os.environ['ATS_ANALYSIS_CACHE_DIR'] = os.path.join(root, 'shared')
+        try:
+            reload_config()
+            first = resume_analysis.get_resume_analysis(resume_text, use_nlp=False)
+            assert resume_analysis.get_resume_analysis(resume_text, use_nlp=False) is first
+            [cached_file] = os.listdir(os.path.join(root, 'shared'))
+            cached_path = os.path.join(root, 'shared', cached_file)
+            save_analysis(cached_path, dataclasses.replace(first, tokens=('from', 'disk')))
+            resume_analysis._analyses.clear()
+            from_disk = resume_analysis.get_resume_analysis(resume_text, use_nlp=False)
+            assert from_disk.tokens == ('from', 'disk') and from_disk.ngrams == first.ngrams
+        finally:
+            del os.environ['ATS_ANALYSIS_CACHE_DIR']
+            resume_analysis._analyses.clear()
+            reload_config()
+
+    print(f"✅ {len(analysis.tokens)} tokens, {len(analysis.ngrams)} n-grams, cache round trip intact")
+    return True
+
+def test_skills_section():
+    """Test the visible skills section: placement, template styling, parsed doc untouched"""
+    import docx
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.shared import Pt
+    from skills_section import save_with_skills_section
+    print(f"\n🧾 Testing Skills Section")
+    print("=" * 30)
+
+    def resume(lines):
+        doc = docx.Document()
+        for text, bold in lines:
+            paragraph = doc.add_paragraph()
+            run = paragraph.add_run(text)
+            if bold:
+                paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
+                run.bold = True
+                run.font.size = Pt(14)
+            else:
+                paragraph.paragraph_format.space_after = Pt(3)
+                run.italic = True
+        return doc
+
+    def add_section(doc):
+        before = doc.element.xml
+        with tempfile.TemporaryDirectory() as root:
+            output = os.path.join(root, 'out', 'resume.docx')
+            save_with_skills_section(doc, ['Kubernetes', 'AWS'], output)
+            assert doc.element.xml == before, "the parsed document must be left unchanged"
+            return docx.Document(output).paragraphs
+
+    skills_block = [("SKILLS", True), ("Python, SQL", False), ("AWS, GCP", False), ("Docker", False)]
+    experience = [("EXPERIENCE", True), ("Built data pipelines", False)]
+
+    # A body line in capitals ("AWS, GCP") does not end the skills block
+    written = add_section(resume(skills_block + experience))
+    assert [p.text for p in written] == ["SKILLS", "Python, SQL", "AWS, GCP", "Docker", "RELEVANT SKILLS",
+                                         "Kubernetes, AWS", "EXPERIENCE", "Built data pipelines"]
+
+    # A summary line mentioning skills is not the skills heading
+    summary = ("Engineer with strong communication skills", False)
+    written = add_section(resume([summary] + skills_block + experience))
+    assert [p.text for p in written][1:7] == ["SKILLS", "Python, SQL", "AWS, GCP", "Docker",
+                                              "RELEVANT SKILLS", "Kubernetes, AWS"]
+
+    # Heading and body copy the template paragraph and run formatting
+    heading, body = written[5], written[6]
+    for new, template in ((heading, written[1]), (body, written[2])):
+        assert new._p.pPr.xml == template._p.pPr.xml
+        assert new.runs[0]._r.rPr.xml == template.runs[0]._r.rPr.xml
+    assert heading.runs[0].bold and heading.alignment == WD_ALIGN_PARAGRAPH.CENTER
+    assert body.runs[0].italic and not body.runs[0].bold
+
+    print(f"✅ Section placed after the skills block with the template's formatting")
+    return True
+
+STARTUP_BUDGET_MS = 300
+HEAVY_MODULES = {'spacy', 'docx', 'docx2pdf', 'requests', 'dotenv'}
+
+def test_startup_imports():
+    """Test that --help and the first menu load no heavy dependency and stay within budget"""
+    print(f"\n⏱️  Testing Startup Imports")
+    print("=" * 30)
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    for script in ('ats_cli.py', 'batch_optimizer.py'):
+        result = subprocess.run([sys.executable, '-X', 'importtime', script, '--help'],
+                                cwd=here, capture_output=True, text=True, timeout=60)
+        assert result.returncode == 0, result.stderr
+
+        total_us = 0
+        imported = set()
+        for line in result.stderr.splitlines():
+            match = re.match(r'import time:\s+\d+ \|\s+(\d+) \|( *)(\S+)', line)
+            if not match:
+                continue
+            imported.add(match.group(3).split('.')[0])
+            if len(match.group(2)) == 1:
+                total_us += int(match.group(1))
+
+        assert not imported & HEAVY_MODULES, f"{script} imports {imported & HEAVY_MODULES}"
+        assert total_us / 1000 < STARTUP_BUDGET_MS, f"{script} imports took {total_us / 1000:.0f}ms"
+        print(f"✅ {script} --help: {total_us / 1000:.0f}ms of imports")
+    return True
+
 def main():
     """Run all tests"""
     print("🚀 ATS Optimizer Test Suite")
@@ -55,13 +634,76 @@ def main():
         # Test 2: File operations
         test2_passed = test_file_operations()
         
+        # Test 3: Keyword analytics
+        test3_passed = test_keyword_analytics()
+        
+        # Test 4: Section segmentation
+        test4_passed = test_section_segmentation()
+        
+        # Test 5: Chunked sections
+        test5_passed = test_chunked_sections()
+        
+        # Test 6: Config reload
+        test6_passed = test_config_reload()
+        
+        # Test 7: Startup imports
+        test7_passed = test_startup_imports()
+        
+        # Test 8: LLM scheduler
+        test8_passed = test_llm_scheduler()
+        
+        # Test 9: Hybrid escalation
+        test9_passed = test_hybrid_escalation()
+        
+        # Test 10: Semantic matching
+        test10_passed = test_semantic_matching()
+        
+        # Test 11: Progress reporter
+        test11_passed = test_progress_reporter()
+        
+        # Test 12: DOCX patch writer
+        test12_passed = test_docx_patch()
+        
+        # Test 13: Output store
+        test13_passed = test_output_store()
+        
+        # Test 14: Language routing
+        test14_passed = test_language_routing()
+        
+        # Test 15: Load harness
+        test15_passed = test_load_harness()
+        
+        # Test 16: Resume analysis
+        test16_passed = test_resume_analysis()
+        
+        # Test 17: Visible skills section
+        test17_passed = test_skills_section()
+        
         # Summary
         print(f"\n📊 Test Results")
         print("=" * 20)
         print(f"✅ Keyword Extraction: {'PASS' if test1_passed else 'FAIL'}")
         print(f"✅ File Operations: {'PASS' if test2_passed else 'FAIL'}")
+        print(f"✅ Keyword Analytics: {'PASS' if test3_passed else 'FAIL'}")
+        print(f"✅ Section Segmentation: {'PASS' if test4_passed else 'FAIL'}")
+        print(f"✅ Chunked Sections: {'PASS' if test5_passed else 'FAIL'}")
+        print(f"✅ Config Reload: {'PASS' if test6_passed else 'FAIL'}")
+        print(f"✅ Startup Imports: {'PASS' if test7_passed else 'FAIL'}")
+        print(f"✅ LLM Scheduler: {'PASS' if test8_passed else 'FAIL'}")
+        print(f"✅ Hybrid Escalation: {'PASS' if test9_passed else 'FAIL'}")
+        print(f"✅ Semantic Matching: {'PASS' if test10_passed else 'FAIL'}")
+        print(f"✅ Progress Reporter: {'PASS' if test11_passed else 'FAIL'}")
+        print(f"✅ DOCX Patch Writer: {'PASS' if test12_passed else 'FAIL'}")
+        print(f"✅ Output Store: {'PASS' if test13_passed else 'FAIL'}")
+        print(f"✅ Language Routing: {'PASS' if test14_passed else 'FAIL'}")
+        print(f"✅ Load Harness: {'PASS' if test15_passed else 'FAIL'}")
+        print(f"✅ Resume Analysis: {'PASS' if test16_passed else 'FAIL'}")
+        print(f"✅ Skills Section: {'PASS' if test17_passed else 'FAIL'}")
         
-        if test1_passed and test2_passed:
+        if all([test1_passed, test2_passed, test3_passed, test4_passed, test5_passed, test6_passed,
+                test7_passed, test8_passed, test9_passed, test10_passed, test11_passed,
+                test12_passed, test13_passed, test14_passed, test15_passed,
+                test16_passed, test17_passed]):
             print(f"\n🎉 All tests passed! The optimizer is ready to use.")
             print(f"\n💡 Next steps:")
             print(f"   1. Run: python3.10 ats_optimizer.py")